@@ -1,9 +1,31 @@
 """
 Console interface for the CryptoSuite.
 Fallback if Tkinter GUI isn't available.
+
+Without arguments it runs interactively. With arguments it encrypts or
+decrypts files in batch:
+
+    python app_cli.py encrypt --cipher hill --key "3 3 2 5" -i in.txt -o out.txt
+    python app_cli.py decrypt --cipher caesar --key 3 -i "texts/*.txt" data/ -o out/ --workers 8
+    python app_cli.py encrypt --cipher playfair --key MONARCHY -i big.txt -o big.enc --profile
+
+`solve` runs every ciphertext-only attack on an unknown ciphertext:
+
+    python app_cli.py solve -i secret.txt --time-limit 30
 """
 
-from cryptoSuite.cryptoSuite import CaesarCipher, AffineCipher, PlayfairCipher, HillCipher
+import argparse
+import contextlib
+import glob
+import math
+import mmap
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+from cryptoSuite.autosolve import ATTACKS, AttackReport, auto_solve
+from cryptoSuite.cryptoSuite import CaesarCipher, AffineCipher, PlayfairCipher, HillCipher, Profile, profile
 
 def parse_affine(s: str):
     parts = [p for p in s.replace(",", " ").split() if p.strip()]
@@ -13,12 +35,12 @@ def parse_affine(s: str):
 
 def parse_hill(s: str):
     nums = list(map(int, __import__("re").findall(r"-?\d+", s)))
-    if len(nums) != 4:
-        raise ValueError("Hill key must contain exactly 4 integers (2x2 matrix).")
-    key = [[nums[0], nums[1]], [nums[2], nums[3]]]
-    # Validate invertibility mod 26 (inverse exists if det has inverse mod 26)
-    det = (key[0][0]*key[1][1] - key[0][1]*key[1][0]) % 26
-    _ = pow(det, -1, 26)  # raises ValueError if not invertible
+    n = math.isqrt(len(nums))
+    if n < 2 or n * n != len(nums):
+        raise ValueError("Hill key must contain n*n integers (4 for 2x2, 9 for 3x3, ...).")
+    key = [nums[i:i + n] for i in range(0, len(nums), n)]
+    # Validate invertibility mod 26
+    HillCipher(key).inverse_key()  # raises ValueError if not invertible
     return key
 
 def get_cipher(name: str, key_text: str):
@@ -33,7 +55,225 @@ def get_cipher(name: str, key_text: str):
         return HillCipher(parse_hill(key_text))
     raise ValueError("Unknown cipher")
 
+# ----- Batch file mode -----
+
+# (cipher, key, operation, input path, output path)
+FileJob = Tuple[str, str, str, str, str]
+
+def expand_inputs(patterns: List[str]) -> List[Tuple[str, str]]:
+    # (path, name relative to the output directory) for every input file.
+    # Directories contribute all files below them, keeping their layout;
+    # files and glob matches are named by their basename.
+    found: List[Tuple[str, str]] = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            for root, _, files in os.walk(pattern):
+                for name in sorted(files):
+                    path = os.path.join(root, name)
+                    found.append((path, os.path.relpath(path, pattern)))
+            continue
+        matches = sorted(glob.glob(pattern, recursive=True)) if glob.has_magic(pattern) else [pattern]
+        if not matches:
+            raise ValueError(f"No files match {pattern!r}")
+        for path in matches:
+            if os.path.isfile(path):
+                found.append((path, os.path.basename(path)))
+            elif not os.path.exists(path):
+                raise ValueError(f"Input not found: {path}")
+    return found
+
+def process_file(job: FileJob) -> int:
+    # Runs in a worker process; key schedules are cached per process
+    cipher_name, key_text, op, src, dst = job
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        raise ValueError("output would overwrite the input file")
+    cipher = get_cipher(cipher_name, key_text)
+    run = cipher.encrypt_bytes if op == "encrypt" else cipher.decrypt_bytes
+
+    with open(src, "rb") as f_in:
+        size = os.fstat(f_in.fileno()).st_size
+        if size == 0:
+            data = run(b"")
+            with open(dst, "wb") as f_out:
+                f_out.write(data)
+            return 0
+
+        with mmap.mmap(f_in.fileno(), 0, access=mmap.ACCESS_READ) as m_in:
+            if isinstance(cipher, (CaesarCipher, AffineCipher)):
+                # Same length out as in: preallocate the output file and
+                # translate straight from one mapping into the other
+                with open(dst, "w+b") as f_out:
+                    f_out.truncate(size)
+                    with mmap.mmap(f_out.fileno(), size) as m_out:
+                        return run(m_in, m_out)
+
+            # Playfair/Hill may grow the text (filler X, padding)
+            data = run(m_in)
+            with open(dst, "wb") as f_out:
+                f_out.truncate(len(data))
+                f_out.write(data)
+            return len(data)
+
+def profile_file(job: FileJob) -> Tuple[int, Profile]:
+    # process_file with instrumentation (--profile); the profile is pickled
+    # back from the worker process
+    with profile() as prof:
+        written = process_file(job)
+    return written, prof
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="cryptosuite",
+        description="Encrypt or decrypt files. Only ASCII letters are transformed; "
+                    "all other bytes are copied unchanged.")
+    parser.add_argument("operation", choices=["encrypt", "decrypt"])
+    parser.add_argument("--cipher", required=True, choices=["caesar", "affine", "playfair", "hill"])
+    parser.add_argument("--key", required=True, help='e.g. 3, "5 8", MONARCHY or "3 3 2 5"')
+    parser.add_argument("-i", "--input", nargs="+", required=True,
+                        help="input files, directories or glob patterns")
+    parser.add_argument("-o", "--output",
+                        help="output file (single input) or directory; "
+                             "a single input is written to stdout if omitted")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="files processed concurrently (default: CPU count)")
+    parser.add_argument("--profile", action="store_true",
+                        help="print per-phase timings, character counts and cache hits to stderr")
+    return parser
+
+def run_batch(argv: List[str]) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    try:
+        get_cipher(args.cipher, args.key)  # validate the key once up front
+        inputs = expand_inputs(args.input)
+    except ValueError as e:
+        parser.error(str(e))
+    if not inputs:
+        parser.error("no input files")
+
+    # A single input goes to a file (or stdout); several go into a directory
+    to_stdout = args.output is None
+    if to_stdout and len(inputs) > 1:
+        parser.error("-o/--output is required for more than one input file")
+    if len(inputs) == 1 and args.output is not None and not os.path.isdir(args.output):
+        targets = [args.output]
+    else:
+        out_dir = args.output or ""
+        targets = [os.path.join(out_dir, name) for _, name in inputs]
+        if len(set(targets)) != len(targets):
+            parser.error("several inputs map to the same output name")
+        for target in targets:
+            os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+
+    if to_stdout:
+        cipher = get_cipher(args.cipher, args.key)
+        run = cipher.encrypt_bytes if args.operation == "encrypt" else cipher.decrypt_bytes
+        with open(inputs[0][0], "rb") as f:
+            mapped = (mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if os.fstat(f.fileno()).st_size
+                      else contextlib.nullcontext(b""))  # empty files cannot be mapped
+            with mapped as data, (profile() if args.profile else contextlib.nullcontext()) as prof:
+                sys.stdout.buffer.write(run(data))
+        if prof is not None:
+            print(prof.summary(), file=sys.stderr)
+        return 0
+
+    jobs = [(args.cipher, args.key, args.operation, src, dst) for (src, _), dst in zip(inputs, targets)]
+    workers = max(1, args.workers or os.cpu_count() or 1)
+    work = profile_file if args.profile else process_file
+    totals = Profile()
+    failed = 0
+
+    def report(job: FileJob, error: Optional[BaseException], result=None) -> None:
+        nonlocal failed
+        if error is not None:
+            failed += 1
+            print(f"{job[3]}: {error}", file=sys.stderr)
+        elif args.profile:
+            totals.merge(result[1])
+
+    # Either way a failing file is reported and the others carry on
+    if workers == 1 or len(jobs) == 1:
+        for job in jobs:
+            try:
+                result = work(job)
+            except Exception as e:
+                report(job, e)
+            else:
+                report(job, None, result)
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+            futures = [(job, pool.submit(work, job)) for job in jobs]
+            for job, future in futures:
+                error = future.exception()
+                report(job, error, None if error else future.result())
+
+    print(f"{len(jobs) - failed}/{len(jobs)} files {args.operation}ed", file=sys.stderr)
+    if args.profile:
+        print(totals.summary(), file=sys.stderr)
+    return 1 if failed else 0
+
+# ----- Auto-solve -----
+
+def format_key(key) -> str:
+    # In the form --key accepts
+    if isinstance(key, (tuple, list)):
+        return " ".join(format_key(k) for k in key)
+    return str(key)
+
+def build_solve_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="cryptosuite solve",
+        description="Recover the cipher and key of a ciphertext by running all attacks at once.")
+    parser.add_argument("-i", "--input", default="-", help="ciphertext file (default: stdin)")
+    parser.add_argument("-t", "--time-limit", type=float, default=60.0,
+                        help="seconds before all attacks are cancelled (default: 60)")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="attacks run concurrently (default: CPU count)")
+    parser.add_argument("--attacks", nargs="+", choices=[a.name for a in ATTACKS],
+                        help="attacks to run (default: all)")
+    parser.add_argument("--top", type=int, default=5, help="candidates to print (default: 5)")
+    return parser
+
+def print_board(reports: List[AttackReport]) -> None:
+    line = "  ".join(f"{r.name}:{r.status}" + (f" {r.progress:.0%}" if r.status == "running" else "")
+                     for r in reports)
+    print("\r" + line.ljust(100), end="", file=sys.stderr, flush=True)
+
+def run_solve(argv: List[str]) -> int:
+    parser = build_solve_parser()
+    args = parser.parse_args(argv)
+    try:
+        if args.input == "-":
+            text = sys.stdin.read()
+        else:
+            with open(args.input, encoding="utf-8", errors="replace") as f:
+                text = f.read()
+    except OSError as e:
+        parser.error(str(e))
+
+    result = auto_solve(text, time_limit=args.time_limit, workers=args.workers, top_k=args.top,
+                        attacks=args.attacks, progress=print_board if sys.stderr.isatty() else None)
+    if sys.stderr.isatty():
+        print(file=sys.stderr)
+
+    for r in result.attacks:
+        best = f"{r.best_score:8.3f}" if r.best_score is not None else "       -"
+        print(f"{r.name:<10}{r.status:<11}{best}{r.seconds:9.2f}s", file=sys.stderr)
+    print(f"{'solved' if result.solved else 'not solved'} in {result.seconds:.2f}s", file=sys.stderr)
+
+    for c in result.candidates:
+        print(f"{c.score:8.3f}  {c.cipher.__name__:<15}{format_key(c.key)}")
+    return 0 if result.solved else 1
+
+# ----- Interactive mode -----
+
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "solve":
+        sys.exit(run_solve(sys.argv[2:]))
+    if len(sys.argv) > 1:
+        sys.exit(run_batch(sys.argv[1:]))
+
     print("CryptoSuite")
     print("Ciphers: caesar, affine, playfair, hill")
     while True:
@@ -4,12 +4,53 @@ Cross-platform (Windows/macOS/Linux) as long as Tkinter is available.
 Run: python app_gui.py
 """
 
+import io
 import re
 import os
+import math
+import queue
+import threading
+import time
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 
-from cryptoSuite.cryptoSuite import CaesarCipher, AffineCipher, PlayfairCipher, HillCipher
+from cryptoSuite.cryptoSuite import (CaesarCipher, AffineCipher, PlayfairCipher, HillCipher,
+                                     decrypt_edit, encrypt_edit, find_edit)
+
+# Longest text put into a Text widget; the rest is kept in memory only
+DISPLAY_LIMIT = 200_000
+# Characters processed between progress updates / cancel checks
+WORK_CHUNK = 1 << 16
+POLL_MS = 100
+# Quiet time after the last edit before the live preview updates
+PREVIEW_DELAY_MS = 300
+# Hill key sizes tried by the known-plaintext crack when no size is given
+CRACK_SIZES = (2, 3, 4)
+
+class Cancelled(Exception):
+    pass
+
+class ProgressReader:
+    # Text reader for encrypt_stream/decrypt_stream that counts what has
+    # been consumed and aborts the operation once cancel is set. Chunks are
+    # sliced from the string (a StringIO would copy it to UCS-4 and back)
+    def __init__(self, text: str, cancel: threading.Event):
+        self._text = text
+        self._cancel = cancel
+        self.total = len(text)
+        self.done = 0
+
+    def read(self, size: int = -1) -> str:
+        if self._cancel.is_set():
+            raise Cancelled()
+        end = self.total if size < 0 else min(self.done + size, self.total)
+        chunk = self._text[self.done:end]
+        self.done = end
+        return chunk
+
+def format_duration(seconds: float) -> str:
+    seconds = int(seconds)
+    return f"{seconds // 60}:{seconds % 60:02d}"
 
 def parse_affine(s: str):
     parts = [p for p in s.replace(",", " ").split() if p.strip()]
@@ -25,12 +66,12 @@ def parse_affine(s: str):
 
 def parse_hill(s: str):
     nums = list(map(int, re.findall(r"-?\d+", s)))
-    if len(nums) != 4:
-        raise ValueError("Hill key must contain exactly 4 integers (2x2 matrix), e.g.:\n3 3\n2 5")
-    key = [[nums[0], nums[1]], [nums[2], nums[3]]]
-    det = (key[0][0]*key[1][1] - key[0][1]*key[1][0]) % 26
+    n = math.isqrt(len(nums))
+    if n < 2 or n * n != len(nums):
+        raise ValueError("Hill key must contain n*n integers (4 for 2x2, 9 for 3x3, ...), e.g.:\n3 3\n2 5")
+    key = [nums[i:i + n] for i in range(0, len(nums), n)]
     try:
-        pow(det, -1, 26)
+        HillCipher(key).inverse_key()
     except ValueError:
         raise ValueError("Hill key invalid: matrix not invertible mod 26.")
     return key
@@ -45,6 +86,27 @@ class App(tk.Tk):
         self.cipher_var = tk.StringVar(value="Caesar")
         self.op_var = tk.StringVar(value="Encrypt")
 
+        # Background job state; results come back through the queue and are
+        # picked up by _poll on the Tk thread
+        self._results = queue.Queue()
+        self._job_id = 0
+        self._cancel = None
+        self._reader = None
+        self._started = 0.0
+
+        # Full texts behind truncated widgets: {widget: (full, shown, visible)},
+        # where the widget shows full[:visible] followed by a note
+        self._full_text = {}
+
+        # Live preview: one worker at a time; the last (settings, input,
+        # output) is kept so that the next edit is re-encrypted incrementally
+        self.preview_var = tk.BooleanVar(value=False)
+        self._preview_results = queue.Queue()
+        self._preview_after = None
+        self._preview_busy = False
+        self._preview_dirty = False
+        self._preview_last = None
+
         self._build_ui()
         self._on_mode_change()
 
@@ -80,6 +142,7 @@ class App(tk.Tk):
         self.key_label.grid(row=1, column=0, sticky="w", pady=(10, 0))
         self.key_entry = ttk.Entry(top, width=55)
         self.key_entry.grid(row=1, column=1, columnspan=3, sticky="we", pady=(10, 0))
+        self.key_entry.bind("<KeyRelease>", self._schedule_preview)
 
         # Helpful hint
         self.hint = ttk.Label(top, text="", foreground="#444")
@@ -94,6 +157,7 @@ class App(tk.Tk):
 
         self.input_text = tk.Text(mid, height=9, wrap="word")
         self.input_text.grid(row=1, column=0, columnspan=3, sticky="nsew", pady=(4, 10))
+        self.input_text.bind("<<Modified>>", self._on_input_modified)
 
         self.extra_label = ttk.Label(mid, text="Known Ciphertext (for Hill crack):")
         self.extra_text = tk.Text(mid, height=7, wrap="word")
@@ -108,8 +172,18 @@ class App(tk.Tk):
         btns = ttk.Frame(self, padding=(12, 10))
         btns.pack(fill="x")
 
-        ttk.Button(btns, text="Run", command=self.run).pack(side="left")
+        self.run_button = ttk.Button(btns, text="Run", command=self.run)
+        self.run_button.pack(side="left")
+        self.cancel_button = ttk.Button(btns, text="Cancel", command=self.cancel, state="disabled")
+        self.cancel_button.pack(side="left", padx=(8, 0))
         ttk.Button(btns, text="Clear", command=self.clear).pack(side="left", padx=8)
+        ttk.Checkbutton(btns, text="Live preview", variable=self.preview_var,
+                        command=self._schedule_preview).pack(side="left", padx=(0, 8))
+
+        self.progress = ttk.Progressbar(btns, length=220, maximum=100)
+        self.progress.pack(side="left", padx=(10, 8))
+        self.status = ttk.Label(btns, text="", foreground="#444")
+        self.status.pack(side="left")
 
         ttk.Button(btns, text="Load Input...", command=self.load_input).pack(side="right")
         ttk.Button(btns, text="Save Output...", command=self.save_output).pack(side="right", padx=8)
@@ -133,14 +207,16 @@ class App(tk.Tk):
         elif cipher == "Playfair":
             hint = "Playfair key: keyword (letters). J is treated as I."
         else:
-            hint = "Hill key (2x2): 4 integers, e.g. 3 3 / 2 5 (matrix must be invertible mod 26)"
+            hint = "Hill key (n x n): n*n integers, e.g. 3 3 / 2 5 (matrix must be invertible mod 26)"
         self.hint.config(text=hint)
 
         if op.startswith("Crack"):
-            # Crack is only meaningful for Hill
+            # Crack is only meaningful for Hill; the key entry takes the key size
             self.cipher_var.set("Hill")
-            self.key_entry.configure(state="disabled")
-            self.key_label.configure(text="Key: (not needed)")
+            self.key_entry.configure(state="normal")
+            self.key_label.configure(text="Key size n:")
+            self.hint.config(text="Hill key size n for an n x n key; leave empty to try "
+                                  + ", ".join(f"{n}x{n}" for n in CRACK_SIZES))
             self.input_label.configure(text="Known Plaintext:")
             self._show_extra_ciphertext(True)
         else:
@@ -148,6 +224,7 @@ class App(tk.Tk):
             self.key_label.configure(text="Key:")
             self.input_label.configure(text="Plaintext:" if op == "Encrypt" else "Ciphertext:")
             self._show_extra_ciphertext(False)
+            self._schedule_preview()
 
     def _show_extra_ciphertext(self, show: bool):
         mid = self.input_text.master
@@ -160,10 +237,50 @@ class App(tk.Tk):
             self.extra_text.grid_forget()
             mid.rowconfigure(3, weight=0)
 
+    # ----- Large texts -----
+
+    def _set_text(self, widget: tk.Text, text: str):
+        # Only the first DISPLAY_LIMIT characters go into the widget; edits
+        # above the note are applied to the full text (see _get_text)
+        shown = text
+        if len(text) > DISPLAY_LIMIT:
+            shown = (text[:DISPLAY_LIMIT] +
+                     f"\n\n[... {len(text) - DISPLAY_LIMIT:,} more characters not shown]")
+            self._full_text[widget] = (text, shown, DISPLAY_LIMIT)
+        else:
+            self._full_text.pop(widget, None)
+        current = widget.get("1.0", "end-1c")
+        if shown and max(shown) > "\uffff" or current and max(current) > "\uffff":
+            # Tk counts characters outside the BMP differently; replace it all
+            widget.delete("1.0", "end")
+            widget.insert("1.0", shown)
+            return
+        # Only the changed span is rewritten, which keeps live preview
+        # updates cheap for the widget
+        start, end, replacement = find_edit(current, shown)
+        if end > start:
+            widget.delete(f"1.0 + {start} chars", f"1.0 + {end} chars")
+        if replacement:
+            widget.insert(f"1.0 + {start} chars", replacement)
+
+    def _get_text(self, widget: tk.Text) -> str:
+        text = widget.get("1.0", "end-1c")
+        full, shown, visible = self._full_text.get(widget, (None, None, 0))
+        if full is None or text == shown:
+            return text if full is None else full
+        start, end, replacement = find_edit(shown, text)
+        if end > visible:
+            # The note itself was edited; the widget text is all there is
+            return text
+        full = full[:start] + replacement + full[end:]
+        self._full_text[widget] = (full, text, visible + len(replacement) - (end - start))
+        return full
+
     def clear(self):
         self.input_text.delete("1.0", "end")
         self.output_text.delete("1.0", "end")
         self.extra_text.delete("1.0", "end")
+        self._full_text.clear()
 
     def load_input(self):
         path = filedialog.askopenfilename(title="Open text file", filetypes=[("Text files", "*.txt"), ("All files", "*.*")])
@@ -171,14 +288,13 @@ class App(tk.Tk):
             return
         with open(path, "r", encoding="utf-8") as f:
             content = f.read()
-        self.input_text.delete("1.0", "end")
-        self.input_text.insert("1.0", content)
+        self._set_text(self.input_text, content)
 
     def save_output(self):
         path = filedialog.asksaveasfilename(defaultextension=".txt", title="Save output", filetypes=[("Text files", "*.txt"), ("All files", "*.*")])
         if not path:
             return
-        out = self.output_text.get("1.0", "end-1c")
+        out = self._get_text(self.output_text)
         with open(path, "w", encoding="utf-8") as f:
             f.write(out)
         messagebox.showinfo("Saved", f"Output saved to:\n{path}")
@@ -197,31 +313,207 @@ class App(tk.Tk):
             return HillCipher(parse_hill(key_text))
         raise ValueError("Unknown cipher")
 
+    # ----- Background jobs -----
+
     def run(self):
+        if self._cancel is not None:
+            return  # a job is already running
         cipher_name = self.cipher_var.get()
         op = self.op_var.get()
+        cancel = threading.Event()
+        reader = None
 
+        # Keys and texts are read here, on the Tk thread; only cipher work
+        # runs in the worker
         try:
             if op.startswith("Crack"):
-                plain = self.input_text.get("1.0", "end-1c")
-                ciph = self.extra_text.get("1.0", "end-1c")
-                key = HillCipher().crack_key(plain, ciph)
-                if not key:
-                    raise ValueError("Could not recover a Hill key from the provided texts.")
-                out = "Recovered Hill key (2x2):\n" + "\n".join(" ".join(map(str, row)) for row in key)
+                plain = self._get_text(self.input_text)
+                ciph = self._get_text(self.extra_text)
+                size_text = self.key_entry.get().strip()
+                sizes = [int(size_text)] if size_text else list(CRACK_SIZES)
+                if sizes[0] < 2:
+                    raise ValueError("Hill key size must be at least 2.")
+
+                def job():
+                    for size in sizes:
+                        identity = [[int(i == j) for j in range(size)] for i in range(size)]
+                        key = HillCipher(identity).crack_key(plain, ciph)
+                        if key:
+                            break
+                    else:
+                        raise ValueError("Could not recover a Hill key from the provided texts.")
+                    n = len(key)
+                    return f"Recovered Hill key ({n}x{n}):\n" + "\n".join(" ".join(map(str, row)) for row in key)
             else:
                 key_text = self.key_entry.get()
                 if not key_text.strip():
                     raise ValueError("Key is required.")
-                text = self.input_text.get("1.0", "end-1c")
                 cipher = self._build_cipher(cipher_name, key_text)
-                out = cipher.encrypt(text) if op == "Encrypt" else cipher.decrypt(text)
+                stream = cipher.encrypt_stream if op == "Encrypt" else cipher.decrypt_stream
+                reader = ProgressReader(self._get_text(self.input_text), cancel)
+
+                def job():
+                    # Chunked so progress can be reported and Cancel honoured
+                    out = io.StringIO()
+                    stream(reader, out, WORK_CHUNK)
+                    return out.getvalue()
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+            return
 
-            self.output_text.delete("1.0", "end")
-            self.output_text.insert("1.0", out)
+        self._job_id += 1
+        job_id = self._job_id
+        self._cancel = cancel
+        self._reader = reader
+        self._started = time.perf_counter()
+
+        def work():
+            try:
+                self._results.put((job_id, "ok", job()))
+            except Cancelled:
+                self._results.put((job_id, "cancelled", None))
+            except Exception as e:
+                self._results.put((job_id, "error", e))
+
+        threading.Thread(target=work, daemon=True).start()
+        self._set_busy(True)
+        self.after(POLL_MS, self._poll)
+
+    def cancel(self):
+        if self._cancel is None:
+            return
+        self._cancel.set()
+        if self._reader is None:
+            # Cracking cannot be interrupted; drop its result when it arrives
+            self._job_id += 1
+            self._finish("Cancelled.")
+
+    def _set_busy(self, busy: bool):
+        self.run_button.configure(state="disabled" if busy else "normal")
+        self.cancel_button.configure(state="normal" if busy else "disabled")
+        if busy and self._reader is None:
+            self.progress.configure(mode="indeterminate")
+            self.progress.start(15)
+        else:
+            self.progress.stop()
+            self.progress.configure(mode="determinate", value=0)
+
+    def _finish(self, status: str):
+        self._cancel = None
+        self._reader = None
+        self._set_busy(False)
+        self.status.configure(text=status)
+
+    def _show_progress(self):
+        reader = self._reader
+        if reader is None or not reader.total:
+            self.status.configure(text=f"Working... {format_duration(time.perf_counter() - self._started)}")
+            return
+        elapsed = max(time.perf_counter() - self._started, 1e-9)
+        rate = reader.done / elapsed
+        self.progress.configure(value=100.0 * reader.done / reader.total)
+        eta = format_duration((reader.total - reader.done) / rate) if rate else "--:--"
+        self.status.configure(text=f"{reader.done:,} / {reader.total:,} chars  "
+                                   f"{rate / 1e6:.2f} Mchar/s  ETA {eta}")
+
+    def _poll(self):
+        try:
+            while True:
+                job_id, status, value = self._results.get_nowait()
+                if job_id == self._job_id:
+                    break
+        except queue.Empty:
+            # Stale results are skipped; keep polling while a job is active
+            if self._cancel is not None:
+                self._show_progress()
+                self.after(POLL_MS, self._poll)
+            return
 
+        elapsed = time.perf_counter() - self._started
+        if status == "ok":
+            self._set_text(self.output_text, value)
+            self._finish(f"Done in {elapsed:.2f} s ({len(value):,} chars).")
+        elif status == "cancelled":
+            self._finish("Cancelled.")
+        else:
+            self._finish("Failed.")
+            messagebox.showerror("Error", str(value))
+
+    # ----- Live preview -----
+
+    def _on_input_modified(self, _event=None):
+        # <<Modified>> fires once until the flag is reset
+        self.input_text.edit_modified(False)
+        self._schedule_preview()
+
+    def _schedule_preview(self, _event=None):
+        # Debounced: the preview runs once typing pauses
+        if self._preview_after is not None:
+            self.after_cancel(self._preview_after)
+            self._preview_after = None
+        if self.preview_var.get():
+            self._preview_after = self.after(PREVIEW_DELAY_MS, self._start_preview)
+
+    def _start_preview(self):
+        self._preview_after = None
+        op = self.op_var.get()
+        if not self.preview_var.get() or op.startswith("Crack") or self._cancel is not None:
+            return
+        if self._preview_busy:
+            # Picked up by _poll_preview once the running preview is done
+            self._preview_dirty = True
+            return
+        key_text = self.key_entry.get()
+        try:
+            cipher = self._build_cipher(self.cipher_var.get(), key_text)
         except Exception as e:
-            messagebox.showerror("Error", str(e))
+            # Usually a key that is still being typed
+            self.status.configure(text=f"Preview: {e}")
+            return
+
+        text = self._get_text(self.input_text)
+        settings = (self.cipher_var.get(), key_text, op)
+        last = self._preview_last
+        if last is not None and last[0] == settings and last[1] == text:
+            return
+        decrypt = op == "Decrypt"
+
+        def work():
+            try:
+                if last is not None and last[0] == settings:
+                    # Only the part of the output the edit can change is redone
+                    start, end, replacement = find_edit(last[1], text)
+                    edit = decrypt_edit if decrypt else encrypt_edit
+                    out = edit(cipher, last[1], last[2], start, end, replacement)
+                else:
+                    out = cipher.decrypt(text) if decrypt else cipher.encrypt(text)
+                self._preview_results.put((settings, text, "ok", out))
+            except Exception as e:
+                self._preview_results.put((settings, text, "error", e))
+
+        self._preview_busy = True
+        threading.Thread(target=work, daemon=True).start()
+        self.after(POLL_MS, self._poll_preview)
+
+    def _poll_preview(self):
+        try:
+            settings, text, status, value = self._preview_results.get_nowait()
+        except queue.Empty:
+            self.after(POLL_MS, self._poll_preview)
+            return
+
+        self._preview_busy = False
+        if status == "ok":
+            self._preview_last = (settings, text, value)
+            if self.preview_var.get() and self._cancel is None:
+                self._set_text(self.output_text, value)
+                self.status.configure(text=f"Preview updated ({len(value):,} chars).")
+        else:
+            self._preview_last = None
+            self.status.configure(text=f"Preview: {value}")
+        if self._preview_dirty:
+            self._preview_dirty = False
+            self._start_preview()
 
 if __name__ == "__main__":
     try:
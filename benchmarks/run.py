@@ -0,0 +1,250 @@
+"""
+Benchmark harness for CryptoSuite.
+
+Times encrypt/decrypt for every cipher over synthetic corpora of several
+sizes and punctuation densities: in memory, streamed, on bytes, with
+parallel=True and batched through encrypt_many. The ciphertext-only and
+known-plaintext attacks are timed on the small inputs. Records
+characters/second plus peak memory. Results are written as JSON; pass a
+previous run with --baseline to flag regressions.
+
+Run:
+    python benchmarks/run.py                                   # quick default matrix
+    python benchmarks/run.py --sizes 1K,10K,100K,1M,10M,100M -o bench.json
+    python benchmarks/run.py --baseline bench.json             # exit 1 on regressions
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from cryptoSuite.cryptoSuite import CaesarCipher, AffineCipher, PlayfairCipher, HillCipher, encrypt_many
+from cryptoSuite.attacks import (crack_hill, crack_hill_2x2, crack_playfair, crack_playfair_dictionary,
+                                 solve_affine, solve_caesar)
+
+# Approximate English letter frequencies (percent), used to build words
+LETTER_FREQ = {
+    "e": 12.7, "t": 9.1, "a": 8.2, "o": 7.5, "i": 7.0, "n": 6.7, "s": 6.3, "h": 6.1, "r": 6.0,
+    "d": 4.3, "l": 4.0, "c": 2.8, "u": 2.8, "m": 2.4, "w": 2.4, "f": 2.2, "g": 2.0, "y": 2.0,
+    "p": 1.9, "b": 1.5, "v": 1.0, "k": 0.8, "j": 0.15, "x": 0.15, "q": 0.1, "z": 0.07,
+}
+PUNCTUATION = ",.;:!?'-\n"
+
+# Inputs larger than this are tiled from one block of this size
+UNIQUE_BLOCK = 1 << 20
+
+# Cracking is size independent past a few hundred letters; skip big inputs
+CRACK_MAX_SIZE = 100 * 1024
+
+# Message size for the encrypt_many case; keys are used round-robin
+BATCH_MESSAGE = 1024
+BATCH_KEYS = {
+    "caesar": [3, 7, 11, 19],
+    "affine": [(5, 8), (7, 3), (11, 20), (25, 1)],
+    "playfair": ["MONARCHY", "PLAYFAIR", "KEYWORD", "WHEATSTONE"],
+    "hill2": [[[3, 3], [2, 5]], [[5, 8], [17, 3]], [[1, 2], [3, 7]], [[7, 2], [3, 1]]],
+}
+
+# Fixed-effort attack settings, so timings compare across runs
+PLAYFAIR_ANNEAL = dict(restarts=1, iterations=2000, seed=0, workers=1)
+DICTIONARY_WORDS = 50000
+
+SIZE_SUFFIXES = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+
+
+def parse_size(text):
+    text = text.strip().upper()
+    if text[-1] in SIZE_SUFFIXES:
+        return int(float(text[:-1]) * SIZE_SUFFIXES[text[-1]])
+    return int(text)
+
+
+def make_corpus(size, density, seed=0):
+    # Random words with English letter frequencies; `density` is the share
+    # of non-letter characters (spaces included)
+    rnd = random.Random(seed)
+    letters, weights = zip(*LETTER_FREQ.items())
+    block_size = min(size, UNIQUE_BLOCK)
+    out = []
+    n = 0
+    while n < block_size:
+        word = "".join(rnd.choices(letters, weights, k=rnd.randint(2, 9)))
+        if rnd.random() < 0.1:
+            word = word.capitalize()
+        gap = max(1, round(len(word) * density / max(1e-9, 1 - density))) if density else 0
+        sep = "".join(rnd.choice(PUNCTUATION) if rnd.random() < 0.3 else " " for _ in range(gap))
+        out.append(word + sep)
+        n += len(word) + len(sep)
+    block = "".join(out)[:block_size]
+    return (block * (size // block_size + 1))[:size]
+
+
+def cases():
+    # (cipher name, operation, setup(text) -> argument, function(argument))
+    hill = HillCipher([[3, 3], [2, 5]])
+    hill3 = HillCipher([[6, 24, 1], [13, 16, 10], [20, 17, 15]])
+    ciphers = [
+        ("caesar", CaesarCipher(3)),
+        ("affine", AffineCipher((5, 8))),
+        ("playfair", PlayfairCipher("MONARCHY")),
+        ("hill2", hill),
+        ("hill3", hill3),
+    ]
+    for name, cipher in ciphers:
+        yield name, "encrypt", lambda text: text, cipher.encrypt
+        yield name, "decrypt", cipher.encrypt, cipher.decrypt
+        yield (name, "encrypt-stream", lambda text: text,
+               lambda text, cipher=cipher: cipher.encrypt_stream(io.StringIO(text), io.StringIO()))
+        yield (name, "decrypt-stream", cipher.encrypt,
+               lambda text, cipher=cipher: cipher.decrypt_stream(io.StringIO(text), io.StringIO()))
+        yield name, "encrypt-bytes", lambda text: text.encode(), cipher.encrypt_bytes
+        yield (name, "decrypt-bytes", lambda text, cipher=cipher: cipher.encrypt_bytes(text.encode()),
+               cipher.decrypt_bytes)
+        yield name, "encrypt-parallel", lambda text: text, lambda text, cipher=cipher: cipher.encrypt(text, parallel=True)
+        if name in BATCH_KEYS:
+            yield (name, "encrypt-many", lambda text, name=name: batch_items(name, text),
+                   lambda items, cipher=cipher: encrypt_many(type(cipher), items))
+
+    # Attacks (only on inputs up to CRACK_MAX_SIZE)
+    yield "caesar", "crack-ciphertext-only", CaesarCipher(3).encrypt, solve_caesar
+    yield "affine", "crack-ciphertext-only", AffineCipher((5, 8)).encrypt, solve_affine
+    yield "hill2", "crack-known-plaintext", lambda text: (text, hill.encrypt(text)), lambda args: hill.crack_key(*args)
+    yield "hill2", "crack-ciphertext-only", hill.encrypt, lambda text: crack_hill_2x2(text, workers=1)
+    yield "hill3", "crack-ciphertext-only", hill3.encrypt, lambda text: crack_hill(text, n=3, workers=1)
+    playfair = PlayfairCipher("MONARCHY")
+    yield "playfair", "crack-ciphertext-only", playfair.encrypt, lambda text: crack_playfair(text, **PLAYFAIR_ANNEAL)
+    yield ("playfair", "crack-dictionary", lambda text: (playfair.encrypt(text), dictionary_words()),
+           lambda args: crack_playfair_dictionary(*args, workers=1))
+
+
+def batch_items(name, text):
+    # The text cut into BATCH_MESSAGE-character messages, keys round-robin
+    keys = BATCH_KEYS[name]
+    return [(keys[i % len(keys)], text[start:start + BATCH_MESSAGE])
+            for i, start in enumerate(range(0, len(text), BATCH_MESSAGE))]
+
+
+def dictionary_words():
+    # Random keywords ending with the real one, so the whole list is tried
+    rnd = random.Random(1)
+    letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    words = ["".join(rnd.choices(letters, k=rnd.randint(4, 12))) for _ in range(DICTIONARY_WORDS - 1)]
+    return words + ["MONARCHY"]
+
+
+def time_call(fn, arg, min_time=0.2, max_runs=5):
+    # Best of several runs; small inputs are repeated until min_time passes
+    best = float("inf")
+    spent = 0.0
+    runs = 0
+    while runs < max_runs and (runs == 0 or spent < min_time):
+        start = time.perf_counter()
+        fn(arg)
+        elapsed = time.perf_counter() - start
+        best = min(best, elapsed)
+        spent += elapsed
+        runs += 1
+    return best
+
+
+def peak_memory(fn, arg):
+    tracemalloc.start()
+    try:
+        fn(arg)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(sizes, densities, measure_memory, only):
+    results = []
+    for size in sizes:
+        for density in densities:
+            text = make_corpus(size, density)
+            for name, op, setup, fn in cases():
+                if only and name not in only:
+                    continue
+                if op.startswith("crack") and size > CRACK_MAX_SIZE:
+                    continue
+                arg = setup(text)
+                seconds = time_call(fn, arg)
+                row = {
+                    "cipher": name,
+                    "op": op,
+                    "size": size,
+                    "density": density,
+                    "seconds": seconds,
+                    "chars_per_sec": size / seconds if seconds else None,
+                    "peak_bytes": peak_memory(fn, arg) if measure_memory else None,
+                }
+                results.append(row)
+                print(f"{name:<9} {op:<22} {size:>11,} B  density {density:<4} {seconds:10.6f} s "
+                      f"{row['chars_per_sec'] / 1e6:10.2f} Mchar/s"
+                      + (f"  peak {row['peak_bytes'] / 1e6:8.1f} MB" if measure_memory else ""))
+    return results
+
+
+def compare(results, baseline, threshold):
+    # Rows whose throughput dropped by more than `threshold` vs. the baseline
+    key = lambda r: (r["cipher"], r["op"], r["size"], r["density"])
+    before = {key(r): r for r in baseline["results"]}
+    regressions = []
+    for row in results:
+        old = before.get(key(row))
+        if not old or not old["chars_per_sec"] or not row["chars_per_sec"]:
+            continue
+        change = row["chars_per_sec"] / old["chars_per_sec"] - 1
+        row["vs_baseline"] = change
+        if change < -threshold:
+            regressions.append((row, change))
+    return regressions
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--sizes", default="1K,10K,100K,1M", help="comma separated, e.g. 1K,10K,100K,1M,10M,100M")
+    ap.add_argument("--densities", default="0,0.2,0.4", help="share of non-letter characters")
+    ap.add_argument("--cipher", action="append", help="only benchmark this cipher (repeatable)")
+    ap.add_argument("--no-memory", action="store_true", help="skip the (slow) peak memory pass")
+    ap.add_argument("-o", "--output", default="bench_results.json")
+    ap.add_argument("--baseline", help="JSON from an earlier run to compare against")
+    ap.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown before flagging (0.10 = 10%%)")
+    args = ap.parse_args()
+
+    sizes = [parse_size(s) for s in args.sizes.split(",")]
+    densities = [float(d) for d in args.densities.split(",")]
+    results = run(sizes, densities, not args.no_memory, args.cipher)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.threshold)
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nwrote {args.output}")
+
+    for row, change in regressions:
+        print(f"REGRESSION {row['cipher']} {row['op']} size={row['size']} density={row['density']}: {change:+.0%}")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
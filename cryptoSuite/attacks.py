@@ -0,0 +1,688 @@
+"""
+Ciphertext-only attacks on the CryptoSuite ciphers.
+
+Every attack returns a ranked list of Candidate(key, score), best first.
+Unless noted otherwise, score is the mean log10 quadgram probability of the
+candidate's decryption (see scoring.py): higher is better and about -5 is
+typical for English.
+"""
+
+from __future__ import annotations
+
+import functools
+import heapq
+import itertools
+import math
+import operator
+import os
+import random
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Callable, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from cryptoSuite.cryptoSuite import _count_candidates, _inverse_mod26, _parallel_map, _worker_count
+from cryptoSuite.scoring import log_probs, log_probs_array, score_codes, text_to_codes, total_log_prob
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; attacks fall back to pruned searches
+    np = None
+
+
+class Candidate(NamedTuple):
+    key: Any
+    score: float
+    # Posterior probability of this key among all keys tried, when the
+    # attack can compute one
+    confidence: Optional[float] = None
+
+
+def _split_range(stop: int, parts: int) -> List[Tuple[int, int]]:
+    step = max(1, -(-stop // parts))
+    return [(i, min(i + step, stop)) for i in range(0, stop, step)]
+
+
+# ---------------------------------------------------------------------------
+# Caesar / Affine
+# ---------------------------------------------------------------------------
+
+# Multipliers a with gcd(a, 26) = 1
+AFFINE_MULTIPLIERS = [a for a in range(1, 26) if math.gcd(a, 26) == 1]
+
+
+def _letter_counts(text: str) -> List[int]:
+    # One pass per letter over C-level str.count; case-insensitive
+    upper = text.upper()
+    return [upper.count(chr(ord('A') + i)) for i in range(26)]
+
+
+@functools.lru_cache(maxsize=None)
+def _affine_key_index(caesar_only: bool) -> Tuple[List[Tuple[int, int]], List[List[int]]]:
+    # For every key (a, b): plaintext letter x was encrypted to (a * x + b) % 26
+    keys = [(a, b) for a in ([1] if caesar_only else AFFINE_MULTIPLIERS) for b in range(26)]
+    return keys, [[(a * x + b) % 26 for x in range(26)] for a, b in keys]
+
+
+def _rank_affine_keys(cipher_text: str, caesar_only: bool, method: str, top_k: int) -> List[Candidate]:
+    # Every key is scored from the 26 letter counts alone: under key (a, b)
+    # plaintext letter x occurs exactly as often as ciphertext letter
+    # (a * x + b) % 26, so no candidate is ever decrypted.
+    if method not in ("chi2", "loglik"):
+        raise ValueError("method must be 'chi2' or 'loglik'")
+    counts = _letter_counts(cipher_text)
+    total = sum(counts)
+    if not total:
+        return []
+
+    keys, index = _affine_key_index(caesar_only)
+    _count_candidates(len(keys))
+    log10p = log_probs(1)
+    expected = [total * 10 ** lp for lp in log10p]
+
+    if np is not None:
+        observed = np.asarray(counts, dtype=np.float64)[np.asarray(index)]
+        loglik = observed @ np.asarray(log10p)
+        chi2 = ((observed - expected) ** 2 / expected).sum(axis=1)
+        loglik, chi2 = loglik.tolist(), chi2.tolist()
+    else:
+        loglik, chi2 = [], []
+        for perm in index:
+            observed = [counts[y] for y in perm]
+            loglik.append(sum(o * lp for o, lp in zip(observed, log10p)))
+            chi2.append(sum((o - e) ** 2 / e for o, e in zip(observed, expected)))
+
+    # Posterior over keys (uniform prior) from the log-likelihoods
+    peak = max(loglik)
+    weights = [10 ** (ll - peak) for ll in loglik]
+    norm = sum(weights)
+
+    ranked = []
+    for i, (a, b) in enumerate(keys):
+        # score: -chi2, or the mean log10 probability per letter
+        score = -chi2[i] if method == "chi2" else loglik[i] / total
+        ranked.append(Candidate(b if caesar_only else (a, b), score, weights[i] / norm))
+    ranked.sort(key=lambda c: c.score, reverse=True)
+    return ranked[:top_k]
+
+
+def solve_caesar(cipher_text: str, top_k: int = 5, method: str = "chi2") -> List[Candidate]:
+    """Rank all 26 Caesar shifts by letter statistics.
+
+    score is minus the chi-squared distance to English letter frequencies
+    (method="chi2") or the mean log10 probability per letter ("loglik").
+    confidence is the key's posterior probability under the likelihood.
+    """
+    return _rank_affine_keys(cipher_text, True, method, top_k)
+
+
+def solve_affine(cipher_text: str, top_k: int = 5, method: str = "chi2") -> List[Candidate]:
+    """Rank all 312 Affine keys (a, b) by letter statistics (see solve_caesar)."""
+    return _rank_affine_keys(cipher_text, False, method, top_k)
+
+
+# ---------------------------------------------------------------------------
+# Hill (2x2)
+# ---------------------------------------------------------------------------
+
+# Letters of ciphertext used for the search; plenty to separate English
+HILL_SAMPLE = 300
+
+# A plaintext block is the ciphertext block times the decryption matrix D,
+# so plaintext letter j of every block depends only on column j of D. Each
+# of the 26 * 26 possible columns v = (x, y) yields one "column stream"
+# (c0 * x + c1 * y) % 26; a key is a pair of streams whose matrix is
+# invertible.
+_UNITS_MOD26 = [math.gcd(d, 26) == 1 for d in range(26)]
+
+
+def _hill2_streams_numpy(c0: Sequence[int], c1: Sequence[int]):
+    v = np.arange(676)
+    x, y = (v // 26)[:, None], (v % 26)[:, None]
+    return (np.asarray(c0)[None, :] * x + np.asarray(c1)[None, :] * y) % 26
+
+
+def _hill2_search(c0: Sequence[int], c1: Sequence[int], start: int, stop: int,
+                  keep: int) -> Tuple[List[Tuple[float, int, int]], int]:
+    # Bigram-score every invertible (first column, second column) pair with
+    # the first column in [start, stop); returns the best `keep` of them
+    # and the number of keys scored
+    bigrams = log_probs_array(2)
+    streams = _hill2_streams_numpy(c0, c1).astype(np.int32)
+    units = np.array(_UNITS_MOD26)
+    v = np.arange(676)
+    x, y = v // 26, v % 26
+
+    best: List[Tuple[float, int, int]] = []
+    scored = 0
+    batch = 16
+    for lo in range(start, stop, batch):
+        u = np.arange(lo, min(lo + batch, stop))
+        first = streams[u][:, None, :]
+        second = streams[None, :, :]
+
+        # Bigrams inside each block, then across block boundaries
+        scores = bigrams[first * 26 + second].sum(axis=2)
+        scores += bigrams[second[:, :, :-1] * 26 + first[:, :, 1:]].sum(axis=2)
+
+        det = (x[u][:, None] * y[None, :] - x[None, :] * y[u][:, None]) % 26
+        invertible = units[det]
+        scores[~invertible] = -np.inf
+        scored += int(invertible.sum())
+
+        flat = scores.ravel()
+        k = min(keep, flat.size)
+        for i in np.argpartition(flat, -k)[-k:]:
+            if np.isfinite(flat[i]):
+                best.append((float(flat[i]), int(u[i // 676]), int(i % 676)))
+        best = heapq.nlargest(keep, best)
+    return best, scored
+
+
+def _hill2_search_pure(c0: Sequence[int], c1: Sequence[int], keep: int,
+                       prune: int = 40) -> Tuple[List[Tuple[float, int, int]], int]:
+    # Without NumPy: keep the `prune` columns whose stream has the most
+    # English letter frequencies, then bigram-score pairs of those only
+    mono = log_probs(1)
+    bigrams = log_probs(2)
+    streams = [[(a * (v // 26) + b * (v % 26)) % 26 for a, b in zip(c0, c1)] for v in range(676)]
+    columns = heapq.nlargest(prune, range(676), key=lambda v: sum(mono[p] for p in streams[v]))
+
+    best: List[Tuple[float, int, int]] = []
+    for u in columns:
+        for w in columns:
+            det = ((u // 26) * (w % 26) - (w // 26) * (u % 26)) % 26
+            if not _UNITS_MOD26[det]:
+                continue
+            first, second = streams[u], streams[w]
+            score = sum(bigrams[a * 26 + b] for a, b in zip(first, second))
+            score += sum(bigrams[b * 26 + a] for a, b in zip(first[1:], second))
+            best.append((score, u, w))
+    return heapq.nlargest(keep, best), len(best)
+
+
+def crack_hill_2x2(cipher_text: str, top_k: int = 5, sample: int = HILL_SAMPLE,
+                   workers: Optional[int] = None) -> List[Candidate]:
+    """Recover 2x2 Hill keys from ciphertext alone.
+
+    With NumPy, all 157,248 invertible keys are bigram-scored on the first
+    `sample` letters, split across `workers` processes (default: all
+    cores). The best few hundred are re-ranked with quadgrams and the top
+    `top_k` encryption keys are returned.
+    """
+    codes = text_to_codes(cipher_text)[:sample]
+    codes = codes[:len(codes) - len(codes) % 2]
+    if len(codes) < 4:
+        return []
+    c0, c1 = codes[0::2], codes[1::2]
+    keep = max(4 * top_k, 200)
+
+    if np is None:
+        pairs, scored = _hill2_search_pure(c0, c1, keep)
+    else:
+        jobs = [(c0, c1, lo, hi, keep) for lo, hi in _split_range(676, 4 * _worker_count(workers))]
+        parts = _parallel_map(_hill2_search, jobs, workers)
+        pairs = heapq.nlargest(keep, (p for part, _ in parts for p in part))
+        scored = sum(n for _, n in parts)
+    _count_candidates(scored)
+
+    ranked: List[Candidate] = []
+    for _, u, w in pairs:
+        dec = [[u // 26, w // 26], [u % 26, w % 26]]
+        plain: List[int] = []
+        for a, b in zip(c0, c1):
+            plain.append((a * dec[0][0] + b * dec[1][0]) % 26)
+            plain.append((a * dec[0][1] + b * dec[1][1]) % 26)
+        ranked.append(Candidate(_inverse_mod26(dec), score_codes(plain)))
+
+    ranked.sort(key=lambda c: c.score, reverse=True)
+    return ranked[:top_k]
+
+
+# ----- n x n: one column of D at a time -----
+
+# Column candidates scored per NumPy batch (bounds the temporaries)
+_COLUMN_BATCH = 1 << 16
+
+# Partial keys kept after each column is added in crack_hill
+HILL_BEAM = 2000
+
+
+def _column_digits(start: int, stop: int, n: int):
+    # Column index v -> its n entries (most significant first), as rows
+    v = np.arange(start, stop)
+    return (v[:, None] // 26 ** np.arange(n - 1, -1, -1)) % 26
+
+
+def _degenerate_column(column: Sequence[int]) -> bool:
+    # A column of an invertible matrix mod 26 cannot vanish mod 2 or mod 13.
+    # Those columns (all entries in {0, 13}, or all even) give streams of
+    # just A/N or of even letters, which letter statistics would favour.
+    return all(x % 2 == 0 for x in column) or all(x % 13 == 0 for x in column)
+
+
+def _hill_column_search(blocks: List[List[int]], start: int, stop: int,
+                        keep: int) -> List[Tuple[float, int]]:
+    # Letter-frequency log-likelihood of the column stream of every column
+    # index in [start, stop); returns the best `keep` (score, index) pairs
+    n = len(blocks[0])
+    best: List[Tuple[float, int]] = []
+    if np is None:
+        mono = log_probs(1)
+        for v in range(start, stop):
+            column = [v // 26 ** (n - 1 - i) % 26 for i in range(n)]
+            if _degenerate_column(column):
+                continue
+            score = sum(mono[sum(map(operator.mul, block, column)) % 26] for block in blocks)
+            best.append((score, v))
+            if len(best) > 4 * keep:
+                best = heapq.nlargest(keep, best)
+        return heapq.nlargest(keep, best)
+
+    mono = log_probs_array(1)
+    c = np.asarray(blocks, dtype=np.int64).T
+    for lo in range(start, stop, _COLUMN_BATCH):
+        hi = min(lo + _COLUMN_BATCH, stop)
+        digits = _column_digits(lo, hi, n)
+        scores = mono[(digits @ c) % 26].sum(axis=1, dtype=np.float64)
+        scores[(digits % 2 == 0).all(axis=1) | (digits % 13 == 0).all(axis=1)] = -np.inf
+        k = min(keep, hi - lo)
+        top = np.argpartition(scores, -k)[-k:]
+        best = heapq.nlargest(keep, best + [(float(scores[i]), lo + int(i)) for i in top if np.isfinite(scores[i])])
+    return best
+
+
+def _column_streams(blocks: List[List[int]], columns: List[int]) -> List[List[int]]:
+    n = len(blocks[0])
+    out = []
+    for v in columns:
+        column = [v // 26 ** (n - 1 - i) % 26 for i in range(n)]
+        out.append([sum(map(operator.mul, block, column)) % 26 for block in blocks])
+    return out
+
+
+def crack_hill(cipher_text: str, n: int = 3, top_k: int = 5, sample: int = HILL_SAMPLE,
+               columns: Optional[int] = None, workers: Optional[int] = None) -> List[Candidate]:
+    """Recover n x n Hill keys from ciphertext alone, one column at a time.
+
+    Plaintext letter j of each block only depends on column j of the
+    decryption matrix, so each of the 26**n possible columns is scored on
+    its own by the letter frequencies of the stream it produces (in
+    parallel, vectorized with NumPy). The best `columns` of them (default
+    20 * n) are put in order with a bigram beam search, invertible
+    matrices are kept, and the full decryptions are ranked by quadgrams.
+    Returns the top_k encryption keys.
+    """
+    codes = text_to_codes(cipher_text)[:sample]
+    blocks = [codes[i:i + n] for i in range(0, len(codes) - n + 1, n)]
+    if n < 2 or len(blocks) < 2 * n:
+        return []
+    keep = columns or 20 * n
+
+    total = 26 ** n
+    jobs = [(blocks, lo, hi, keep) for lo, hi in _split_range(total, 4 * _worker_count(workers))]
+    ranked_columns = heapq.nlargest(keep, (p for part in _parallel_map(_hill_column_search, jobs, workers) for p in part))
+    _count_candidates(total)
+    cols = [v for _, v in ranked_columns]
+    streams = _column_streams(blocks, cols)
+
+    # Bigram scores of column u followed by column w inside a block, and
+    # of u ending one block followed by w starting the next
+    bigrams = log_probs(2)
+    m = len(cols)
+    inner = [[sum(bigrams[a * 26 + b] for a, b in zip(streams[u], streams[w])) for w in range(m)] for u in range(m)]
+    across = [[sum(bigrams[a * 26 + b] for a, b in zip(streams[u], streams[w][1:])) for w in range(m)] for u in range(m)]
+
+    beam: List[Tuple[float, Tuple[int, ...]]] = [(0.0, (u,)) for u in range(m)]
+    for _ in range(n - 1):
+        grown = ((score + inner[order[-1]][w], order + (w,))
+                 for score, order in beam for w in range(m) if w not in order)
+        beam = heapq.nlargest(HILL_BEAM, grown)
+    beam = sorted(((score + across[order[-1]][order[0]], order) for score, order in beam), reverse=True)
+
+    ranked: List[Candidate] = []
+    for _, order in beam:
+        dec = [[cols[j] // 26 ** (n - 1 - i) % 26 for j in order] for i in range(n)]
+        try:
+            key = _inverse_mod26(dec)
+        except ValueError:
+            continue
+        plain = [streams[j][b] for b in range(len(blocks)) for j in order]
+        ranked.append(Candidate(key, score_codes(plain)))
+        if len(ranked) >= max(4 * top_k, 200):
+            break
+
+    ranked.sort(key=lambda c: c.score, reverse=True)
+    return ranked[:top_k]
+
+
+# ---------------------------------------------------------------------------
+# Playfair
+# ---------------------------------------------------------------------------
+
+# Letters of ciphertext used for scoring candidate keysquares
+PLAYFAIR_SAMPLE = 600
+
+# Annealing temperature per scored quadgram (about 16 for the default sample)
+PLAYFAIR_TEMP = 0.027
+
+_SQUARE_ALPHABET = [ord(ch) - ord('A') for ch in "ABCDEFGHIKLMNOPQRSTUVWXYZ"]
+
+# Cell index -> row start / column / right neighbour / lower neighbour
+_ROW_START = [i - i % 5 for i in range(25)]
+_COL = [i % 5 for i in range(25)]
+_RIGHT = [i - i % 5 + (i + 1) % 5 for i in range(25)]
+_DOWN = [(i + 5) % 25 for i in range(25)]
+
+
+def _playfair_pairs(cipher_text: str, sample: int) -> List[Tuple[int, int]]:
+    codes = text_to_codes(cipher_text.upper().replace("J", "I"))[:sample]
+    return list(zip(codes[0::2], codes[1::2]))
+
+
+def _playfair_decrypt_codes(square: List[int], pairs: Sequence[Tuple[int, int]]) -> List[int]:
+    # Decrypt letter-code digrams under `square` (25 letter codes, row-major)
+    # using only index arithmetic; same row -> right, same column -> down,
+    # as in PlayfairCipher.decrypt
+    pos = [0] * 26
+    for i, letter in enumerate(square):
+        pos[letter] = i
+
+    out: List[int] = []
+    append = out.append
+    for a, b in pairs:
+        pa, pb = pos[a], pos[b]
+        if _ROW_START[pa] == _ROW_START[pb]:
+            append(square[_RIGHT[pa]])
+            append(square[_RIGHT[pb]])
+        elif _COL[pa] == _COL[pb]:
+            append(square[_DOWN[pa]])
+            append(square[_DOWN[pb]])
+        else:
+            append(square[_ROW_START[pa] + _COL[pb]])
+            append(square[_ROW_START[pb] + _COL[pa]])
+    return out
+
+
+def _mutate_square(square: List[int], rnd: random.Random) -> List[int]:
+    # Mostly swap two letters; occasionally a whole-square move
+    new = square[:]
+    move = rnd.random()
+    if move < 0.90:
+        i, j = rnd.sample(range(25), 2)
+        new[i], new[j] = new[j], new[i]
+    elif move < 0.94:
+        r1, r2 = rnd.sample(range(5), 2)
+        new[r1 * 5:r1 * 5 + 5], new[r2 * 5:r2 * 5 + 5] = square[r2 * 5:r2 * 5 + 5], square[r1 * 5:r1 * 5 + 5]
+    elif move < 0.98:
+        c1, c2 = rnd.sample(range(5), 2)
+        for r in range(0, 25, 5):
+            new[r + c1], new[r + c2] = square[r + c2], square[r + c1]
+    else:
+        new.reverse()
+    return new
+
+
+def _playfair_anneal(pairs: List[Tuple[int, int]], iterations: int, deadline: Optional[float],
+                     seed: int, progress: Optional[Callable[[float, float], bool]] = None) -> Tuple[float, str, int]:
+    # One simulated-annealing run from a random keysquare; returns the best
+    # (quadgram total, keysquare) seen and the number of steps run
+    rnd = random.Random(seed)
+    square = _SQUARE_ALPHABET[:]
+    rnd.shuffle(square)
+    score = total_log_prob(_playfair_decrypt_codes(square, pairs))
+    best_score, best_square = score, square
+
+    # Fixed temperature in log10 units, scaled to the sample length. Runs
+    # near PLAYFAIR_TEMP per quadgram wander between local optima and find
+    # the true square; cooling towards zero freezes them in the nearest one
+    temp = PLAYFAIR_TEMP * (2 * len(pairs) - 3)
+    steps = iterations
+    for it in range(iterations):
+        if it % 256 == 0:
+            if ((deadline is not None and time.time() > deadline)
+                    or (progress is not None and progress(it / iterations, best_score / (2 * len(pairs) - 3)))):
+                steps = it
+                break
+        candidate = _mutate_square(square, rnd)
+        cand_score = total_log_prob(_playfair_decrypt_codes(candidate, pairs))
+        delta = cand_score - score
+        if delta >= 0 or rnd.random() < math.exp(delta / temp):
+            square, score = candidate, cand_score
+            if score > best_score:
+                best_score, best_square = score, square
+
+    return best_score, "".join(chr(c + ord('A')) for c in best_square), steps
+
+
+def crack_playfair(cipher_text: str, top_k: int = 5, restarts: int = 8, iterations: int = 150000,
+                   time_limit: Optional[float] = None, sample: int = PLAYFAIR_SAMPLE,
+                   workers: Optional[int] = None, seed: Optional[int] = None,
+                   progress: Optional[Callable[[float, float], bool]] = None) -> List[Candidate]:
+    """Recover a Playfair keysquare from ciphertext alone.
+
+    Runs `restarts` independent simulated-annealing searches over 5x5
+    keysquares (letter swaps plus row/column swaps and reversal) at a fixed
+    temperature, scored by quadgram fitness, in parallel across `workers` processes. Each run stops
+    after `iterations` steps or once `time_limit` seconds have passed. The
+    returned keys are 25-letter keysquares, usable as PlayfairCipher(key).
+
+    progress(fraction, best_score), if given, is called every few hundred
+    steps of each run; the run stops early when it returns True. It must be
+    picklable when the runs go to a process pool.
+    """
+    pairs = _playfair_pairs(cipher_text, sample)
+    if len(pairs) < 2:
+        return []
+    deadline = time.time() + time_limit if time_limit is not None else None
+    base = random.Random(seed).randrange(1 << 30)
+
+    jobs = [(pairs, iterations, deadline, base + r, progress) for r in range(restarts)]
+    runs = _parallel_map(_playfair_anneal, jobs, workers)
+
+    # Every step scores one candidate keysquare; counted here because the
+    # runs may have been in other processes
+    _count_candidates(sum(steps for _, _, steps in runs))
+    letters = 2 * len(pairs)
+    best = {square: total / (letters - 3) for total, square, _ in runs}
+    ranked = [Candidate(square, score) for square, score in best.items()]
+    ranked.sort(key=lambda c: c.score, reverse=True)
+    return ranked[:top_k]
+
+
+# ----- Dictionary attack -----
+
+# Letters of ciphertext used to score each dictionary keysquare
+DICTIONARY_SAMPLE = 200
+
+# Keywords read and shipped to a worker at a time
+DICTIONARY_CHUNK = 20000
+
+# Squares decrypted together in one NumPy batch (bounds the temporaries)
+_SQUARE_BATCH = 2048
+
+_NON_AZ = re.compile(r"[^A-Z]+")
+_AZ = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+# Uppercase ASCII byte -> letter code, anything else -> 26
+_KEY_CODES = bytes(b - ord('A') if ord('A') <= b <= ord('Z') else 26 for b in range(256))
+
+# Cells (pa * 25 + pb) of a ciphertext digram -> cells of its decryption:
+# same row -> right, same column -> down, otherwise swap columns
+_DECRYPT_CELLS = [
+    (_RIGHT[pa], _RIGHT[pb]) if _ROW_START[pa] == _ROW_START[pb] else
+    (_DOWN[pa], _DOWN[pb]) if _COL[pa] == _COL[pb] else
+    (_ROW_START[pa] + _COL[pb], _ROW_START[pb] + _COL[pa])
+    for pa in range(25) for pb in range(25)
+]
+
+
+def keyword_square(keyword: str) -> Optional[str]:
+    """The 25-letter keysquare PlayfairCipher(keyword) uses, row by row.
+
+    Returns None for keywords with letters outside A-Z, which would push
+    letters of the alphabet out of the square.
+    """
+    key = keyword.upper()
+    if not key.isascii() and any(ch.isalpha() and not 'A' <= ch <= 'Z' for ch in key):
+        return None
+    return "".join(dict.fromkeys(_NON_AZ.sub("", key) + _AZ)).replace("J", "")
+
+
+def _keyword_squares(words: List[str]) -> Tuple[List[str], bytes]:
+    # The usable keywords and their squares as letter codes, 25 bytes each
+    keys = [w.upper() for w in words]
+    if not "".join(keys).isascii():
+        usable = [(w, k) for w, k in zip(words, keys) if keyword_square(k) is not None]
+        words = [w for w, _ in usable]
+        keys = [k.encode("ascii", "ignore").decode("ascii") for _, k in usable]
+    if not keys:
+        return [], b""
+
+    if np is None:
+        squares = "".join(keyword_square(k) for k in keys)  # type: ignore[misc]
+        return words, squares.encode("ascii").translate(_KEY_CODES)
+
+    # First position of every letter in every keyword, all keywords at
+    # once: np.unique reports the first occurrence of each (word, letter).
+    # Letters a keyword lacks rank after its own, in alphabetical order.
+    lengths = np.fromiter(map(len, keys), dtype=np.intp, count=len(keys))
+    codes = np.frombuffer("".join(keys).encode("ascii").translate(_KEY_CODES), dtype=np.uint8)
+    word = np.repeat(np.arange(len(keys)), lengths)
+    offset = np.arange(len(codes)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    letter = codes < 26
+    cells, first = np.unique(word[letter] * 26 + codes[letter], return_index=True)
+
+    rank = np.tile(np.arange(26) + int(lengths.max()), (len(keys), 1))
+    rank.flat[cells] = offset[letter][first]
+    order = np.argsort(rank, axis=1)
+    # Drop J, as PlayfairCipher does
+    squares = order[order != ord('J') - ord('A')].astype(np.uint8)
+    return words, squares.tobytes()
+
+
+@functools.lru_cache(maxsize=None)
+def _quadgram_table():
+    return log_probs_array(4)
+
+
+@functools.lru_cache(maxsize=None)
+def _decrypt_cell_arrays():
+    cells = np.asarray(_DECRYPT_CELLS, dtype=np.intp)
+    return cells[:, 0].copy(), cells[:, 1].copy()
+
+
+def _square_totals_numpy(squares: bytes, pairs: Sequence[Tuple[int, int]]):
+    # Quadgram totals of the decryptions under many squares (letter codes,
+    # 25 bytes each) at once, one row per square
+    sq = np.frombuffer(squares, dtype=np.uint8).reshape(-1, 25)
+    rows = np.arange(len(sq))[:, None]
+    pos = np.zeros((len(sq), 26), dtype=np.intp)
+    pos[rows, sq] = np.arange(25)
+
+    a, b = (np.asarray(col, dtype=np.intp) for col in zip(*pairs))
+    cell = pos[:, a] * 25 + pos[:, b]
+    dec_a, dec_b = _decrypt_cell_arrays()
+    plain = np.empty((len(sq), 2 * len(pairs)), dtype=np.intp)
+    plain[:, 0::2] = sq[rows, dec_a[cell]]
+    plain[:, 1::2] = sq[rows, dec_b[cell]]
+    idx = ((plain[:, :-3] * 26 + plain[:, 1:-2]) * 26 + plain[:, 2:-1]) * 26 + plain[:, 3:]
+    return _quadgram_table()[idx].sum(axis=1, dtype=np.float64)
+
+
+def _score_keywords(keywords: List[str], squares: bytes, pairs: List[Tuple[int, int]],
+                    top_k: int) -> List[Tuple[float, str]]:
+    # Worker-process entry point: the top_k (quadgram total, keyword) pairs
+    best: List[Tuple[float, str]] = []
+    if np is not None:
+        for lo in range(0, len(keywords), _SQUARE_BATCH):
+            totals = _square_totals_numpy(squares[25 * lo:25 * (lo + _SQUARE_BATCH)], pairs).tolist()
+            best = heapq.nlargest(top_k, itertools.chain(best, zip(totals, keywords[lo:lo + _SQUARE_BATCH])))
+        return best
+
+    for i, keyword in enumerate(keywords):
+        total = total_log_prob(_playfair_decrypt_codes(list(squares[25 * i:25 * i + 25]), pairs))
+        if len(best) < top_k:
+            heapq.heappush(best, (total, keyword))
+        elif total > best[0][0]:
+            heapq.heapreplace(best, (total, keyword))
+    return best
+
+
+def _read_keywords(wordlist: Union[str, os.PathLike, Iterable[str]]) -> Iterator[str]:
+    if isinstance(wordlist, (str, os.PathLike)):
+        with open(wordlist, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                word = line.strip()
+                if word:
+                    yield word
+    else:
+        for word in wordlist:
+            word = word.strip()
+            if word:
+                yield word
+
+
+def _unique_square_chunks(wordlist: Union[str, os.PathLike, Iterable[str]],
+                          chunk_size: int) -> Iterator[Tuple[List[str], bytes]]:
+    # (keywords, squares) in chunks, each square only the first time it
+    # comes up. Squares are remembered by hash (one int each), so memory
+    # grows with the number of distinct squares, not with the wordlist.
+    seen = set()
+    words = _read_keywords(wordlist)
+    while True:
+        batch = list(itertools.islice(words, chunk_size))
+        if not batch:
+            return
+        keywords, squares = _keyword_squares(batch)
+        fresh: List[str] = []
+        fresh_squares: List[bytes] = []
+        for i, keyword in enumerate(keywords):
+            square = squares[25 * i:25 * i + 25]
+            h = hash(square)
+            if h not in seen:
+                seen.add(h)
+                fresh.append(keyword)
+                fresh_squares.append(square)
+        if fresh:
+            _count_candidates(len(fresh))
+            yield fresh, b"".join(fresh_squares)
+
+
+def crack_playfair_dictionary(cipher_text: str, wordlist: Union[str, os.PathLike, Iterable[str]],
+                              top_k: int = 5, sample: int = DICTIONARY_SAMPLE,
+                              chunk_size: int = DICTIONARY_CHUNK,
+                              workers: Optional[int] = None) -> List[Candidate]:
+    """Try every keyword of a wordlist as the Playfair key.
+
+    wordlist is a file path (one keyword or phrase per line) or an iterable
+    of strings, read `chunk_size` keywords at a time. Keywords that expand
+    to an already tried keysquare are skipped. Each new square decrypts
+    the first `sample` ciphertext letters and is scored by quadgram
+    fitness across `workers` processes. Returns the top_k keywords.
+    """
+    pairs = _playfair_pairs(cipher_text, sample)
+    if len(pairs) < 2:
+        return []
+    chunks = _unique_square_chunks(wordlist, chunk_size)
+    workers = _worker_count(workers)
+
+    best: List[Tuple[float, str]] = []
+    if workers == 1:
+        for keywords, squares in chunks:
+            best = heapq.nlargest(top_k, best + _score_keywords(keywords, squares, pairs, top_k))
+    else:
+        # At most two chunks per worker in flight, so the wordlist is never
+        # read far ahead of the scoring
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = set()
+            for keywords, squares in chunks:
+                pending.add(pool.submit(_score_keywords, keywords, squares, pairs, top_k))
+                if len(pending) >= 2 * workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        best = heapq.nlargest(top_k, best + future.result())
+            for future in pending:
+                best = heapq.nlargest(top_k, best + future.result())
+
+    letters = 2 * len(pairs)
+    return [Candidate(keyword, total / (letters - 3)) for total, keyword in best]
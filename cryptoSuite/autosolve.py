@@ -0,0 +1,255 @@
+"""
+Automatic ciphertext-only solving.
+
+auto_solve() races the attacks from attacks.py against each other in a
+process pool, cheapest first and the family classify() guesses ahead of
+the rest. Every candidate key is rescored the same way (quadgram fitness
+of its decryption), workers post their progress and best score to a
+shared board, and once a candidate scores like English the attacks still
+queued or running are cancelled. The whole race stays within a time limit.
+"""
+
+from __future__ import annotations
+
+import functools
+import multiprocessing
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Callable, Dict, IO, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from cryptoSuite.attacks import crack_hill, crack_hill_2x2, crack_playfair, solve_affine, solve_caesar
+from cryptoSuite.classifier import _read_letters, classify
+from cryptoSuite.cryptoSuite import AffineCipher, CaesarCipher, HillCipher, PlayfairCipher, _worker_count
+from cryptoSuite.scoring import score_codes, text_to_codes
+
+
+# Letters of the ciphertext handed to the attacks; they sample far fewer
+SOLVE_LETTERS = 4096
+
+# Letters decrypted to rescore each candidate (a multiple of 2, 3 and 4)
+SOLVE_SAMPLE = 600
+
+# Mean log10 quadgram probability that counts as solved: English scores
+# about -4.5, the best wrong keys -6.5 or lower
+SOLVED_SCORE = -5.0
+
+# The family classify() guesses is taken to be this much cheaper
+_GUESS_WEIGHT = 10
+
+# Seconds between checks of the board and the deadline
+_POLL = 0.1
+
+
+class Attack(NamedTuple):
+    name: str
+    cipher: type
+    solver: Callable[..., Any]
+    params: Dict[str, Any]       # extra solver arguments
+    cost: float                  # rough seconds per task on one core
+
+
+# Each attack runs on one core; Playfair is split into one task per
+# annealing restart so the restarts spread over the pool
+ATTACKS = (
+    Attack("caesar", CaesarCipher, solve_caesar, {}, 0.01),
+    Attack("affine", AffineCipher, solve_affine, {}, 0.01),
+    Attack("hill3", HillCipher, crack_hill, {"n": 3, "workers": 1}, 0.3),
+    Attack("hill2", HillCipher, crack_hill_2x2, {"workers": 1}, 0.8),
+    Attack("hill4", HillCipher, crack_hill, {"n": 4, "workers": 1}, 1.2),
+    Attack("playfair", PlayfairCipher, crack_playfair, {"restarts": 1, "workers": 1}, 20.0),
+)
+
+_ATTACKS = {attack.name: attack for attack in ATTACKS}
+
+
+class SolveCandidate(NamedTuple):
+    attack: str                  # name of the attack that found it
+    cipher: type                 # cipher(key).decrypt(text) gives the plaintext
+    key: Any
+    score: float                 # mean log10 quadgram probability of the decryption
+
+
+class AttackReport(NamedTuple):
+    name: str
+    status: str                  # "queued", "running", "done", "stopped", "cancelled" or "failed"
+    progress: float              # 0 to 1
+    best_score: Optional[float]
+    seconds: float               # worker time spent, summed over the attack's tasks
+
+
+class SolveResult(NamedTuple):
+    candidates: List[SolveCandidate]   # best first
+    attacks: List[AttackReport]
+    solved: bool                 # a candidate reached the threshold
+    seconds: float
+
+
+# ---------------------------------------------------------------------------
+# Workers
+# ---------------------------------------------------------------------------
+
+# Set in every worker by _init_worker: [progress, best score] per task and
+# the event that tells running attacks to stop
+_board = None
+_cancel = None
+
+
+def _init_worker(board, cancel) -> None:
+    global _board, _cancel
+    _board, _cancel = board, cancel
+
+
+def _post(slot: int, fraction: float, score: float, stop_score: float = float("inf")) -> bool:
+    # Progress hook for interruptible attacks; True asks them to stop, once
+    # cancelled or once their best already scores `stop_score`
+    _board[2 * slot] = fraction
+    _board[2 * slot + 1] = max(_board[2 * slot + 1], score)
+    return _cancel.is_set() or score >= stop_score
+
+
+def _rescore(cipher: type, key: Any, sample: str) -> float:
+    try:
+        return score_codes(text_to_codes(cipher(key).decrypt(sample)))
+    except ValueError:
+        return float("-inf")
+
+
+def _run_attack(slot: int, name: str, letters: str, params: Dict[str, Any], deadline: float,
+                threshold: float, top_k: int) -> Tuple[List[SolveCandidate], float, str]:
+    # Runs in a worker; returns the rescored candidates, the seconds spent
+    # and the task's status
+    if _cancel.is_set():
+        return [], 0.0, "cancelled"  # queued before the cancel, never started
+    start = time.perf_counter()
+    attack = _ATTACKS[name]
+    params = dict(attack.params, **params)
+    interruptible = attack.solver is crack_playfair
+    if interruptible:
+        params.update(time_limit=max(0.0, deadline - time.time()),
+                      progress=functools.partial(_post, slot, stop_score=threshold))
+
+    sample = letters[:SOLVE_SAMPLE]
+    sample = sample[:len(sample) - len(sample) % 12]
+    found = [SolveCandidate(name, attack.cipher, c.key, _rescore(attack.cipher, c.key, sample))
+             for c in attack.solver(letters, top_k=top_k, **params)]
+    _post(slot, 1.0, max((c.score for c in found), default=float("-inf")))
+    stopped = interruptible and (_cancel.is_set() or time.time() > deadline)
+    return found, time.perf_counter() - start, "stopped" if stopped else "done"
+
+
+# ---------------------------------------------------------------------------
+# Scheduler
+# ---------------------------------------------------------------------------
+
+def _attack_order(letters: str, names: List[str]) -> List[str]:
+    # Cheapest first, with the cost of the family the classifier guesses
+    # cut by _GUESS_WEIGHT
+    guess = classify(letters)
+    if guess.label == "hill":
+        guess_name = "hill%d" % guess.params.get("n", 2)
+    else:
+        guess_name = guess.label
+
+    def cost(name: str) -> float:
+        return _ATTACKS[name].cost / (_GUESS_WEIGHT if name == guess_name else 1)
+    return sorted(names, key=cost)
+
+
+def _combine(statuses: List[str]) -> str:
+    # One status for an attack split over several tasks
+    for status in ("running", "queued", "failed"):
+        if status in statuses:
+            return status
+    return statuses[0] if len(set(statuses)) == 1 else "stopped"
+
+
+def auto_solve(source: Union[str, IO[str]], time_limit: float = 60.0, workers: Optional[int] = None,
+               threshold: float = SOLVED_SCORE, top_k: int = 10, attacks: Optional[Iterable[str]] = None,
+               restarts: int = 8, seed: Optional[int] = None,
+               progress: Optional[Callable[[List[AttackReport]], None]] = None) -> SolveResult:
+    """Try every ciphertext-only attack on a text at once and rank the keys.
+
+    The attacks (ATTACKS, or the names given in `attacks`) run across
+    `workers` processes (default: all cores), cheapest first with the
+    family classify() guesses moved ahead. Playfair runs as `restarts`
+    annealing tasks. As soon as a candidate scores at least `threshold`
+    the remaining attacks are cancelled; after `time_limit` seconds
+    everything is cancelled and running Playfair searches stop (the other
+    attacks take a second or so and finish), so at most `workers` *
+    `time_limit` CPU seconds are spent. progress(reports), if given, is
+    called with the board a few times per second.
+
+    Returns the best `top_k` candidates over all attacks, each scored by
+    the quadgram fitness of its decryption, with a report per attack.
+    """
+    started = time.perf_counter()
+    deadline = time.time() + time_limit
+    letters = _read_letters(source, SOLVE_LETTERS)[0].decode("ascii")
+    names = list(_ATTACKS) if attacks is None else list(dict.fromkeys(attacks))
+    unknown = [name for name in names if name not in _ATTACKS]
+    if unknown:
+        raise ValueError("Unknown attack: " + ", ".join(unknown))
+    names = _attack_order(letters, names)
+
+    # (attack name, extra parameters) per task, in submission order
+    base = random.Random(seed).randrange(1 << 30)
+    tasks: List[Tuple[str, Dict[str, Any]]] = []
+    for name in names:
+        if _ATTACKS[name].solver is crack_playfair:
+            tasks.extend((name, {"seed": base + r}) for r in range(restarts))
+        else:
+            tasks.append((name, {}))
+    if not tasks:
+        raise ValueError("No attacks to run.")
+
+    board = multiprocessing.RawArray("d", [0.0, float("-inf")] * len(tasks))
+    cancel = multiprocessing.Event()
+    statuses = ["queued"] * len(tasks)
+    seconds = [0.0] * len(tasks)
+    candidates: List[SolveCandidate] = []
+    solved = False
+
+    def reports() -> List[AttackReport]:
+        result = []
+        for name in names:
+            slots = [slot for slot, (task, _) in enumerate(tasks) if task == name]
+            best = max(board[2 * slot + 1] for slot in slots)
+            result.append(AttackReport(
+                name, _combine([statuses[slot] for slot in slots]),
+                sum(board[2 * slot] for slot in slots) / len(slots),
+                best if best != float("-inf") else None,
+                sum(seconds[slot] for slot in slots)))
+        return result
+
+    workers = min(_worker_count(workers), len(tasks))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(board, cancel)) as pool:
+        futures = {pool.submit(_run_attack, slot, name, letters, params, deadline, threshold, top_k): slot
+                   for slot, (name, params) in enumerate(tasks)}
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, timeout=_POLL, return_when=FIRST_COMPLETED)
+            for future in done:
+                slot = futures[future]
+                if future.cancelled():
+                    statuses[slot] = "cancelled"
+                elif future.exception() is not None:
+                    statuses[slot] = "failed"
+                else:
+                    found, seconds[slot], statuses[slot] = future.result()
+                    candidates.extend(found)
+                    solved = solved or any(c.score >= threshold for c in found)
+            for future in pending:
+                if future.running():
+                    statuses[futures[future]] = "running"
+            if (solved or time.time() > deadline) and not cancel.is_set():
+                cancel.set()
+                for future in pending:
+                    future.cancel()
+            if progress is not None:
+                progress(reports())
+
+    # Several Hill sizes or Playfair restarts can find the same key
+    unique = {(c.cipher, repr(c.key)): c for c in candidates}
+    candidates = sorted(unique.values(), key=lambda c: c.score, reverse=True)
+    return SolveResult(candidates[:top_k], reports(), solved, time.perf_counter() - started)
@@ -0,0 +1,225 @@
+"""
+Cipher-type classifier for triaging ciphertext.
+
+classify() reads at most a few thousand letters of a text, computes cheap
+statistics in one pass (letter counts, index of coincidence, doubled
+digrams, the letter J, block periodicity) and guesses which CryptoSuite
+cipher produced it, together with the cipher class and the ciphertext-only
+solver from attacks.py to hand it to. classify_files() does the same for
+many files across a process pool.
+"""
+
+from __future__ import annotations
+
+import functools
+import operator
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, IO, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from cryptoSuite.attacks import (_affine_key_index, crack_hill, crack_hill_2x2, crack_playfair,
+                                 solve_affine, solve_caesar)
+from cryptoSuite.cryptoSuite import AffineCipher, CaesarCipher, HillCipher, PlayfairCipher, _worker_count
+from cryptoSuite.scoring import log_probs
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the affine fit falls back to a loop
+    np = None
+
+
+# Letters looked at per text; plenty to separate the cipher types
+CLASSIFY_LETTERS = 4096
+
+# Characters read per chunk from a file or reader
+_READ_CHUNK = 1 << 14
+
+# Hill block sizes the periodicity test looks for
+HILL_SIZES = (2, 3, 4)
+
+# Fewer letters than this cannot be classified
+_MIN_LETTERS = 40
+
+# Mean log10 letter probability of English is about -1.22; ciphers that
+# are not a letter substitution score -1.45 or lower under every key
+_FIT_THRESHOLD = -1.36
+
+# At most one doubled digram or J per this many letters in Playfair output
+_PLAYFAIR_STRAYS = 400
+
+# Aligned vs misaligned block coincidences at the Hill block size
+_PERIOD_THRESHOLD = 1.6
+
+# Byte table that keeps A-Z only (after upper())
+_NON_LETTERS = bytes(b for b in range(256) if not ord('A') <= b <= ord('Z'))
+
+
+class TextStats(NamedTuple):
+    letters: int                 # A-Z letters looked at
+    complete: bool               # False if the text had more letters
+    counts: Tuple[int, ...]      # per letter A..Z
+    ioc: float                   # index of coincidence
+    doubled: int                 # digrams (at even positions) with equal letters
+    periods: Dict[int, float]    # block size -> aligned/misaligned coincidence ratio
+
+
+class Classification(NamedTuple):
+    label: str                   # "english", "caesar", "affine", "playfair", "hill" or "unknown"
+    cipher: Optional[type]       # cipher class, e.g. HillCipher
+    solver: Optional[Callable[..., Any]]
+    params: Dict[str, Any]       # extra solver arguments, e.g. {"n": 3}
+    stats: TextStats
+
+
+# ---------------------------------------------------------------------------
+# Statistics
+# ---------------------------------------------------------------------------
+
+def _read_letters(source: Union[str, IO[str]], limit: int) -> Tuple[bytes, bool]:
+    # Up to `limit` A-Z letters (uppercased) and whether that was all of them
+    if isinstance(source, str):
+        chunks: Iterable[str] = (source[i:i + _READ_CHUNK] for i in range(0, len(source), _READ_CHUNK))
+    else:
+        chunks = iter(lambda: source.read(_READ_CHUNK), "")
+    buf = b""
+    for chunk in chunks:
+        buf += chunk.encode("ascii", "ignore").upper().translate(None, _NON_LETTERS)
+        if len(buf) > limit:
+            return buf[:limit], False
+    return buf, True
+
+
+def _coincidences(buf: bytes, n: int, offset: int) -> int:
+    # Pairs of equal n-grams among those starting at offset, offset + n, ...
+    if np is not None:
+        blocks = (len(buf) - offset) // n
+        codes = np.frombuffer(buf, dtype=np.uint8)[offset:offset + blocks * n].reshape(blocks, n)
+        keys = codes.astype(np.int32) @ (32 ** np.arange(n, dtype=np.int32))
+        counts = np.unique(keys, return_counts=True)[1]
+        return int((counts * (counts - 1)).sum())
+    return sum(c * (c - 1) for c in Counter(zip(*(buf[offset + i::n] for i in range(n)))).values())
+
+
+def _block_periods(buf: bytes) -> Dict[int, float]:
+    # Hill encrypts each n-letter block on its own, so n-grams starting at
+    # multiples of n repeat far more often than n-grams at other offsets
+    periods = {}
+    for n in HILL_SIZES:
+        aligned = _coincidences(buf, n, 0)
+        misaligned = sum(_coincidences(buf, n, off) for off in range(1, n)) / (n - 1)
+        periods[n] = (aligned + 1) / (misaligned + 1)
+    return periods
+
+
+def text_stats(source: Union[str, IO[str]], limit: int = CLASSIFY_LETTERS) -> TextStats:
+    """Statistics of the first `limit` letters of a string or text reader."""
+    buf, complete = _read_letters(source, limit)
+    total = len(buf)
+    counts = tuple(buf.count(ord('A') + i) for i in range(26))
+    ioc = sum(c * (c - 1) for c in counts) / (total * (total - 1)) if total > 1 else 0.0
+    doubled = sum(map(operator.eq, buf[0::2], buf[1::2]))
+    return TextStats(total, complete, counts, ioc, doubled, _block_periods(buf))
+
+
+@functools.lru_cache(maxsize=None)
+def _fit_matrix():
+    # Row k, column y: log10 probability of the plaintext letter that
+    # ciphertext letter y decrypts to under Affine key k
+    keys, index = _affine_key_index(False)
+    log10p = log_probs(1)
+    rows = []
+    for perm in index:
+        row = [0.0] * 26
+        for x, y in enumerate(perm):
+            row[y] = log10p[x]
+        rows.append(row)
+    return np.asarray(rows) if np is not None else rows
+
+
+def _best_fit(counts: Tuple[int, ...]) -> Tuple[float, Tuple[int, int]]:
+    # Best mean log10 letter probability over all Affine keys (a, b)
+    keys, _ = _affine_key_index(False)
+    if np is not None:
+        fits = (_fit_matrix() @ np.asarray(counts, dtype=np.float64)).tolist()
+    else:
+        fits = [sum(map(operator.mul, row, counts)) for row in _fit_matrix()]
+    best = max(range(len(keys)), key=fits.__getitem__)
+    return fits[best] / sum(counts), keys[best]
+
+
+# ---------------------------------------------------------------------------
+# Classification
+# ---------------------------------------------------------------------------
+
+def _hill_size(periods: Dict[int, float]) -> int:
+    # The smallest block size that stands out; multiples of the true size
+    # stand out too
+    floor = max(_PERIOD_THRESHOLD, max(periods.values()) / 2)
+    for n in sorted(periods):
+        if periods[n] >= floor:
+            return n
+    return max(periods, key=periods.__getitem__)
+
+
+def classify_stats(stats: TextStats) -> Classification:
+    """Guess the cipher type from precomputed TextStats (see classify)."""
+    if stats.letters < _MIN_LETTERS:
+        return Classification("unknown", None, None, {}, stats)
+
+    # Letter substitutions keep the English letter distribution
+    fit, (a, b) = _best_fit(stats.counts)
+    if fit >= _FIT_THRESHOLD:
+        if a != 1:
+            return Classification("affine", AffineCipher, solve_affine, {}, stats)
+        if b != 0:
+            return Classification("caesar", CaesarCipher, solve_caesar, {}, stats)
+        return Classification("english", None, None, {}, stats)
+
+    # Playfair never puts a letter twice in one digram, never outputs J
+    # and always outputs an even number of letters. A few strays are
+    # allowed for letters the scan does not see (e.g. accented ones).
+    strays = stats.letters // _PLAYFAIR_STRAYS
+    if (stats.doubled <= strays and stats.counts[ord('J') - ord('A')] <= strays
+            and (stats.letters % 2 == 0 or not stats.complete)):
+        return Classification("playfair", PlayfairCipher, crack_playfair, {}, stats)
+
+    n = _hill_size(stats.periods)
+    if n == 2:
+        return Classification("hill", HillCipher, crack_hill_2x2, {}, stats)
+    return Classification("hill", HillCipher, crack_hill, {"n": n}, stats)
+
+
+def classify(source: Union[str, IO[str]], limit: int = CLASSIFY_LETTERS) -> Classification:
+    """Guess which cipher produced a text (a string or text reader).
+
+    Only the first `limit` letters are read. The label is "english" for
+    plaintext, "unknown" for texts with too few letters, or the cipher
+    name; cipher and solver are the class and the attacks.py function to
+    try next (call solver(text, **params)). The Hill block size is taken
+    from block periodicity and is only a guess for short texts.
+    """
+    return classify_stats(text_stats(source, limit))
+
+
+def _classify_file(path: str, limit: int) -> Classification:
+    with open(path, encoding="utf-8", errors="replace") as f:
+        return classify(f, limit)
+
+
+def classify_files(paths: Iterable[Union[str, os.PathLike]], limit: int = CLASSIFY_LETTERS,
+                   workers: Optional[int] = None) -> List[Tuple[str, Classification]]:
+    """classify() every file, across `workers` processes (default: all cores).
+
+    Each file is read only up to its first `limit` letters, so memory stays
+    bounded however large the files are. Results come back in input order.
+    """
+    paths = [os.fspath(p) for p in paths]
+    workers = _worker_count(workers)
+    if workers == 1 or len(paths) <= 1:
+        results = [_classify_file(p, limit) for p in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as pool:
+            chunksize = max(1, len(paths) // (8 * workers))
+            results = list(pool.map(_classify_file, paths, [limit] * len(paths), chunksize=chunksize))
+    return list(zip(paths, results))
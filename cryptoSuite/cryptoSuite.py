@@ -1,55 +1,793 @@
 from __future__ import annotations
 
-from typing import List, Tuple, Optional
+import collections
+import contextlib
+import functools
+import inspect
+import itertools
+import os
+import re
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from operator import mul
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, NamedTuple, Tuple, Optional, TextIO, Union
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; Hill falls back to pure Python
+    np = None
 
 
 # ---------------------------------------------------------------------------
-# 1) Caesar Cipher
+# 0) Key schedule cache
 # ---------------------------------------------------------------------------
 
-class CaesarCipher:
-    def __init__(self, key: int = 3) -> None:
-        self.key = key
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class KeyScheduleCache:
+    """Size-bounded LRU cache of compiled key material.
+
+    Like functools.lru_cache, but one instance per kind of key material so
+    each can be sized, inspected and cleared on its own. Values are built
+    outside the lock; failures (e.g. a singular Hill key) are not cached.
+    """
+
+    def __init__(self, name: str, maxsize: int) -> None:
+        self.name = name
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: "collections.OrderedDict[Any, Any]" = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Any, build: Callable[[], Any]) -> Any:
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._data.move_to_end(key)
+                return value
 
-    def encrypt(self, plain_text: str) -> str:
-        plain_text = plain_text.lower()
-        result_chars: List[str] = []
+        value = build()
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
 
-        for ch in plain_text:
-            if ch.isalpha():
-                # Convert 'a'..'z' -> 0..25
-                x = ord(ch) - ord('a')
+    def info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
 
-                # Shift by key with wrap-around
-                y = (x + self.key) % 26
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
 
-                # Convert back to letter and output as uppercase
-                out_ch = chr(y + ord('A'))
-                result_chars.append(out_ch)
-            else:
-                result_chars.append(ch)
 
-        return "".join(result_chars)
+# Translation tables are shared by Caesar and Affine (Caesar is a = 1)
+_TABLE_CACHE = KeyScheduleCache("affine_tables", 256)
+_AFFINE_INVERSE_CACHE = KeyScheduleCache("affine_inverses", 26)
+_PLAYFAIR_CACHE = KeyScheduleCache("playfair_schedules", 256)
+_HILL_INVERSE_CACHE = KeyScheduleCache("hill_inverses", 256)
+_KEY_CACHES = [_TABLE_CACHE, _AFFINE_INVERSE_CACHE, _PLAYFAIR_CACHE, _HILL_INVERSE_CACHE]
+
+
+def cache_info() -> Dict[str, CacheInfo]:
+    # Hit/miss statistics of every key schedule cache, by name
+    return {cache.name: cache.info() for cache in _KEY_CACHES}
 
-    def decrypt(self, cipher_text: str) -> str:
-        cipher_text = cipher_text.upper()
-        result_chars: List[str] = []
 
-        for ch in cipher_text:
-            if ch.isalpha():
-                # Convert 'A'..'Z' -> 0..25
-                x = ord(ch) - ord('A')
+def cache_clear() -> None:
+    for cache in _KEY_CACHES:
+        cache.clear()
+
+
+# ---------------------------------------------------------------------------
+# 0a) Instrumentation
+# ---------------------------------------------------------------------------
+
+class ProfileEvent(NamedTuple):
+    cipher: str     # "caesar", "affine", "playfair", "hill", "pipeline"
+    operation: str  # method name, e.g. "encrypt_bytes" or "crack_key"
+    phase: str      # preprocess, transform, reinsert, render, or "total"
+    seconds: float
+    chars: int      # characters produced ("total" events only)
+
+
+class OpStats:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.chars_in = 0
+        self.chars_out = 0
+        self.seconds = 0.0
+        self.phases: Dict[str, float] = {}
+
+
+class Profile:
+    """Timings and counters collected while a profile() block is active.
+
+    ops maps (cipher, operation) to OpStats; only the outermost cipher call
+    is counted, and its phases cover the time spent in the shared helpers.
+    cache holds the key schedule cache hits/misses during the block, and
+    candidates the number of keys or alignments tried by crack_key and the
+    Caesar/Affine solvers.
+    """
+
+    PHASES = ("preprocess", "transform", "reinsert", "render")
+
+    def __init__(self, callback: Optional[Callable[[ProfileEvent], None]] = None) -> None:
+        self.ops: Dict[Tuple[str, str], OpStats] = {}
+        self.candidates = 0
+        self.cache: Dict[str, CacheInfo] = {}
+        self.callback = callback
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Picklable, so worker processes can send their profile back
+        return {"ops": self.ops, "candidates": self.candidates, "cache": self.cache}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__()
+        self.__dict__.update(state)
+
+    def merge(self, other: "Profile") -> None:
+        with self._lock:
+            for op, theirs in other.ops.items():
+                mine = self.ops.setdefault(op, OpStats())
+                mine.calls += theirs.calls
+                mine.chars_in += theirs.chars_in
+                mine.chars_out += theirs.chars_out
+                mine.seconds += theirs.seconds
+                for phase, seconds in theirs.phases.items():
+                    mine.phases[phase] = mine.phases.get(phase, 0.0) + seconds
+            self.candidates += other.candidates
+            for name, theirs in other.cache.items():
+                mine = self.cache.get(name, CacheInfo(0, 0, theirs.maxsize, 0))
+                self.cache[name] = CacheInfo(mine.hits + theirs.hits, mine.misses + theirs.misses,
+                                             theirs.maxsize, max(mine.currsize, theirs.currsize))
+
+    def summary(self) -> str:
+        header = (f"{'cipher':<9} {'operation':<15} {'calls':>6} {'chars in':>11} {'chars out':>11} "
+                  f"{'total s':>9} " + " ".join(f"{p:>10}" for p in self.PHASES) + f" {'Mchar/s':>8}")
+        lines = [header, "-" * len(header)]
+        for (cipher, op), st in sorted(self.ops.items()):
+            rate = st.chars_in / st.seconds / 1e6 if st.seconds else 0.0
+            phases = " ".join(f"{st.phases.get(p, 0.0):>10.4f}" for p in self.PHASES)
+            lines.append(f"{cipher:<9} {op:<15} {st.calls:>6} {st.chars_in:>11,} {st.chars_out:>11,} "
+                         f"{st.seconds:>9.4f} {phases} {rate:>8.2f}")
+        if self.candidates:
+            lines.append(f"crack candidates evaluated: {self.candidates:,}")
+        for name, info in sorted(self.cache.items()):
+            if info.hits or info.misses:
+                lines.append(f"cache {name}: {info.hits} hits, {info.misses} misses")
+        return "\n".join(lines)
+
+    # ----- Recording (called by the instrumented code) -----
+
+    def _begin(self, cipher: str, operation: str) -> bool:
+        # False inside another cipher call: nested calls are not counted
+        if getattr(self._local, "op", None) is not None:
+            return False
+        self._local.op = (cipher, operation)
+        self._local.depth = 0
+        return True
+
+    def _end(self, chars_in: int, chars_out: int, seconds: float) -> None:
+        op, self._local.op = self._local.op, None
+        with self._lock:
+            st = self.ops.setdefault(op, OpStats())
+            st.calls += 1
+            st.chars_in += chars_in
+            st.chars_out += chars_out
+            st.seconds += seconds
+        if self.callback is not None:
+            self.callback(ProfileEvent(op[0], op[1], "total", seconds, chars_out))
+
+    def _enter_phase(self) -> bool:
+        # Only the outermost phase of a cipher call is timed
+        if getattr(self._local, "op", None) is None or self._local.depth:
+            return False
+        self._local.depth = 1
+        return True
+
+    def _leave_phase(self, phase: str, seconds: float) -> None:
+        self._local.depth = 0
+        op = self._local.op
+        with self._lock:
+            phases = self.ops.setdefault(op, OpStats()).phases
+            phases[phase] = phases.get(phase, 0.0) + seconds
+        if self.callback is not None:
+            self.callback(ProfileEvent(op[0], op[1], phase, seconds, 0))
+
+
+# The active profile; None (the default) keeps instrumentation to one
+# global lookup per helper call
+_PROFILE: Optional[Profile] = None
+
+
+@contextlib.contextmanager
+def profile(callback: Optional[Callable[[ProfileEvent], None]] = None) -> Iterator[Profile]:
+    """Collect cipher timings for the duration of a with block.
+
+        with profile() as prof:
+            HillCipher(key).encrypt(text)
+        print(prof.summary())
+
+    callback, if given, receives a ProfileEvent for every timed phase and
+    for every finished cipher call. Profiling is process-wide; work done
+    in worker processes (parallel=True) counts as transform time.
+    """
+    global _PROFILE
+    prof = Profile(callback)
+    before = cache_info()
+    previous, _PROFILE = _PROFILE, prof
+    try:
+        yield prof
+    finally:
+        _PROFILE = previous
+        for name, info in cache_info().items():
+            old = before[name]
+            prof.cache[name] = CacheInfo(max(0, info.hits - old.hits), max(0, info.misses - old.misses),
+                                         info.maxsize, info.currsize)
+
+
+def _phase(name: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    # Times a shared helper as one phase of the current cipher call
+    def decorate(fn: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(fn)
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            prof = _PROFILE
+            if prof is None or not prof._enter_phase():
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                prof._leave_phase(name, time.perf_counter() - start)
+        return timed
+    return decorate
+
+
+class _CountingReader:
+    def __init__(self, reader: TextIO) -> None:
+        self.reader = reader
+        self.count = 0
+
+    def read(self, size: int = -1) -> str:
+        text = self.reader.read(size)
+        self.count += len(text)
+        return text
+
+
+def _size(value: Any) -> int:
+    try:
+        return len(value)
+    except TypeError:
+        return 0
+
+
+def _operation(inputs: int = 1) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    # Counts a public cipher method as one call. The first `inputs`
+    # arguments after self are the input (a reader for *_stream methods),
+    # whether passed by position or by keyword.
+    def decorate(fn: Callable[..., Any]) -> Callable[..., Any]:
+        signature = inspect.signature(fn)
+        names = list(signature.parameters)[1:1 + inputs]
+        stream = fn.__name__.endswith("_stream")
+
+        @functools.wraps(fn)
+        def counted(self: Any, *args: Any, **kwargs: Any) -> Any:
+            prof = _PROFILE
+            if prof is None:
+                return fn(self, *args, **kwargs)
+            # Inspect the arguments before _begin so a bad call cannot leave
+            # the thread marked as inside an operation
+            try:
+                bound = signature.bind(self, *args, **kwargs)
+            except TypeError:
+                return fn(self, *args, **kwargs)  # raises the usual error
+            reader = None
+            if stream and names[0] in bound.arguments:
+                reader = bound.arguments[names[0]] = _CountingReader(bound.arguments[names[0]])
+            chars_in = 0 if stream else sum(_size(bound.arguments.get(name)) for name in names)
+            if not prof._begin(type(self).__name__.replace("Cipher", "").lower(), fn.__name__):
+                return fn(self, *args, **kwargs)
+
+            start = time.perf_counter()
+            result: Any = None
+            try:
+                result = fn(*bound.args, **bound.kwargs)
+                return result
+            finally:
+                if reader is not None:
+                    chars_in = reader.count
+                if isinstance(result, int):
+                    chars_out = result
+                elif isinstance(result, (str, bytes)):
+                    chars_out = len(result)
+                else:
+                    chars_out = 0
+                prof._end(chars_in, chars_out, time.perf_counter() - start)
+        return counted
+    return decorate
+
+
+def _count_candidates(n: int) -> None:
+    prof = _PROFILE
+    if prof is not None:
+        with prof._lock:
+            prof.candidates += n
+
+
+# ---------------------------------------------------------------------------
+# 0b) Shared translation tables (Caesar / Affine)
+# ---------------------------------------------------------------------------
 
-                # Reverse shift by key
-                y = (x - self.key) % 26
+class _AffineTable(Dict[int, Union[int, str]]):
+    """``str.translate`` table for the letter map ``y = (m * x + c) % 26``.
+
+    ASCII letters of both cases are filled in up front, so pure-ASCII text
+    never needs case folding. Other code points are resolved on first sight
+    with the same ``ord``/``%``/``chr`` arithmetic as the per-character
+    loop, which keeps non-ASCII letters byte-identical to it.
+    """
+
+    def __init__(self, m: int, c: int, decrypt: bool) -> None:
+        super().__init__()
+        self.m = m
+        self.c = c
+        # Encryption reads lowercase and writes uppercase; decryption the reverse
+        self.src_base = ord('A') if decrypt else ord('a')
+        self.dst_base = ord('a') if decrypt else ord('A')
+
+        # bytes.translate counterpart for ASCII byte strings
+        byte_table = bytearray(range(256))
+        for x in range(26):
+            out_ch = chr((m * x + c) % 26 + self.dst_base)
+            self[ord('a') + x] = out_ch
+            self[ord('A') + x] = out_ch
+            byte_table[ord('a') + x] = byte_table[ord('A') + x] = ord(out_ch)
+        self.byte_table = bytes(byte_table)
+
+    def __missing__(self, code: int) -> Union[int, str]:
+        ch = chr(code)
+        if ch.isalpha():
+            out: Union[int, str] = chr((self.m * (code - self.src_base) + self.c) % 26 + self.dst_base)
+        else:
+            out = code
+        self[code] = out
+        return out
+
+
+def _affine_table(m: int, c: int, decrypt: bool) -> _AffineTable:
+    # Only m and c mod 26 matter
+    m, c = m % 26, c % 26
+    return _TABLE_CACHE.get((m, c, decrypt), lambda: _AffineTable(m, c, decrypt))
+
+
+def _affine_code_table(m: int, c: int) -> bytes:
+    # bytes.translate table for the same map on letter codes (A=0 .. Z=25)
+    m, c = m % 26, c % 26
+    return _TABLE_CACHE.get(("codes", m, c), lambda: bytes((m * b + c) % 26 for b in range(256)))
+
+
+def _translate(text: str, table: _AffineTable, decrypt: bool) -> str:
+    # ASCII text is handled entirely by the table; anything else is case
+    # folded first, exactly like the original per-character loop
+    if not text.isascii():
+        text = text.upper() if decrypt else text.lower()
+    return text.translate(table)
 
-                # Convert back and output as lowercase
-                out_ch = chr(y + ord('a'))
-                result_chars.append(out_ch)
+
+# ---------------------------------------------------------------------------
+# 0c) Layout preservation (Playfair / Hill)
+# ---------------------------------------------------------------------------
+
+# A skeleton is the list of (index, run of non-letters) found in the input
+Skeleton = List[Tuple[int, str]]
+
+_ASCII_SYMBOL_RUN = re.compile(r"[^A-Za-z]+")
+
+
+def _split_ascii_layout(text: str) -> Tuple[str, Skeleton]:
+    # Only A-Z / a-z count as letters
+    skeleton = [(m.start(), m.group()) for m in _ASCII_SYMBOL_RUN.finditer(text)]
+    return _ASCII_SYMBOL_RUN.sub("", text), skeleton
+
+
+def _split_layout(text: str) -> Tuple[str, Skeleton]:
+    # Separate the letter stream from the punctuation skeleton in one pass
+    if text.isascii():
+        return _split_ascii_layout(text)
+
+    letters: List[str] = []
+    skeleton = []
+    pos = 0
+    for is_letter, group in itertools.groupby(text, str.isalpha):
+        run = "".join(group)
+        if is_letter:
+            letters.append(run)
+        else:
+            skeleton.append((pos, run))
+        pos += len(run)
+    return "".join(letters), skeleton
+
+
+@_phase("preprocess")
+def _letters_only(text: str) -> str:
+    # The letter stream of _split_layout without building the skeleton
+    if text.isascii():
+        return _ASCII_SYMBOL_RUN.sub("", text)
+    return "".join(filter(str.isalpha, text))
+
+
+def _merge_layout(letters: str, skeleton: Skeleton) -> str:
+    # Put every symbol run back at its original index; letters fill the gaps
+    # in order and any surplus (padding, filler X) ends up at the end. This is
+    # what inserting the symbols one by one did, but in a single pass.
+    pieces: List[str] = []
+    out_len = 0
+    used = 0
+    for pos, run in skeleton:
+        chunk = letters[used:used + pos - out_len]
+        pieces.append(chunk)
+        pieces.append(run)
+        used += len(chunk)
+        out_len += len(chunk) + len(run)
+    pieces.append(letters[used:])
+    return "".join(pieces)
+
+
+# Playfair and Hill run on a LetterStream: one byte per letter holding its
+# code (A=0 .. Z=25), plus the layout needed to put letters back. It is built
+# once per call, transformed as bytes and rendered once at the end, instead
+# of re-filtering, case folding and joining one-character strings per step.
+# Output case is fixed by the operation, so no per-letter case is kept.
+
+# From about this many characters of ASCII text a NumPy letter mask is
+# cheaper than a skeleton of symbol runs
+_NUMPY_MIN_LAYOUT = 256
+
+_LETTER_CODES = bytes((b | 32) - ord('a') if chr(b).isascii() and chr(b).isalpha() else 0 for b in range(256))
+_UPPER_LETTERS = bytes(ord('A') + b % 26 for b in range(256))
+_LOWER_LETTERS = bytes(ord('a') + b % 26 for b in range(256))
+
+
+class LetterStream(NamedTuple):
+    codes: bytes
+    # A Skeleton, or for ASCII input with NumPy (original bytes, letter
+    # mask, letter count), which needs no per-run Python objects
+    layout: Any
+    # The uppercased letters when they are not all A-Z, else "". Hill
+    # reduces such letters mod 26; Playfair keeps them, as a keyword may
+    # put them in its matrix
+    upper: str
+
+
+def _letter_codes(letters: str) -> bytes:
+    # Codes of an ASCII or uppercased letter string
+    if letters.isascii():
+        return letters.encode("ascii").translate(_LETTER_CODES)
+    return bytes([(ord(ch) - ord('A')) % 26 for ch in letters])
+
+
+@_phase("render")
+def _code_letters(codes: bytes, lower: bool = False) -> str:
+    return codes.translate(_LOWER_LETTERS if lower else _UPPER_LETTERS).decode("ascii")
+
+
+@_phase("preprocess")
+def _letter_stream(text: Union[str, BytesLike]) -> LetterStream:
+    # For bytes input only ASCII A-Z / a-z are letters (see _bytes_text)
+    raw = not isinstance(text, str)
+    if np is not None and len(text) >= _NUMPY_MIN_LAYOUT and (raw or text.isascii()):
+        data = np.frombuffer(text if raw else text.encode("ascii"), dtype=np.uint8)
+        folded = (data | 32) - ord('a')  # non-letters wrap around past 25
+        mask = folded < 26
+        codes = folded[mask].tobytes()
+        return LetterStream(codes, (data, mask, len(codes)), "")
+
+    letters, skeleton = _split_ascii_layout(_bytes_text(text)) if raw else _split_layout(text)
+    upper = ""
+    if not letters.isascii():
+        letters = letters.upper()
+        if not letters.isascii():
+            upper = letters
+    return LetterStream(_letter_codes(letters), skeleton, upper)
+
+
+@_phase("reinsert")
+def _place_letters(letters: str, layout: Any) -> str:
+    # Inverse of _letter_stream, with _merge_layout's rules
+    if isinstance(layout, list):
+        return _merge_layout(letters, layout)
+    data, mask, count = layout
+    if len(letters) < count or not letters.isascii():
+        skeleton = _split_ascii_layout(data.tobytes().decode("latin-1"))[1]
+        return _merge_layout(letters, skeleton)
+    raw = letters.encode("ascii")
+    out = data.copy()
+    out[mask] = np.frombuffer(raw, dtype=np.uint8, count=count)
+    return (out.tobytes() + raw[count:]).decode("latin-1")
+
+
+def _render(codes: bytes, layout: Any, lower: bool = False) -> str:
+    return _place_letters(_code_letters(codes, lower), layout)
+
+
+# ---------------------------------------------------------------------------
+# 0d) Streaming helpers
+# ---------------------------------------------------------------------------
+
+# Characters read per step by the *_stream methods
+CHUNK_SIZE = 1 << 16
+
+# Longest whitespace-free run held back for case folding before giving up
+_MAX_WORD_CARRY = 1 << 20
+
+_LAST_WHITESPACE = re.compile(r"\s\S*\Z")
+
+# ASCII characters that are neither cased nor whitespace but that final
+# sigma skips over when looking for a letter before it
+_ASCII_CASE_IGNORABLE = "'.:^`"
+
+
+def _iter_chunks(reader: TextIO, chunk_size: int) -> Iterator[str]:
+    while True:
+        chunk = reader.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+@_phase("transform")
+def _translate_stream(reader: TextIO, writer: TextIO, table: _AffineTable, decrypt: bool,
+                      chunk_size: int) -> int:
+    written = 0
+    carry = ""
+    for chunk in _iter_chunks(reader, chunk_size):
+        text = carry + chunk
+        start, carry = len(carry), ""
+        if not decrypt:
+            # str.lower() is context sensitive (final sigma), so never split
+            # the context of a sigma across two calls
+            if text.isascii():
+                # Only the last character before any trailing ' . : ^ `
+                # (which a sigma looks through) can matter to what follows
+                cut = max(len(text.rstrip(_ASCII_CASE_IGNORABLE)) - 1, 0)
             else:
-                result_chars.append(ch)
+                # Hold back everything after the last whitespace until more
+                # text arrives (within a sane limit). Only the new chunk is
+                # searched; the carry was searched when it arrived
+                match = _LAST_WHITESPACE.search(text, start)
+                cut = match.start() + 1 if match else 0
+            if cut or len(text) < _MAX_WORD_CARRY:
+                text, carry = text[:cut], text[cut:]
+        written += writer.write(_translate(text, table, decrypt))
+    if carry:
+        written += writer.write(_translate(carry, table, decrypt))
+    return written
+
+
+class _LowerWriter:
+    def __init__(self, writer: TextIO) -> None:
+        self.writer = writer
+
+    def write(self, text: str) -> int:
+        return self.writer.write(text.lower())
+
+
+def _letter_offset(skeleton: Skeleton, i: int) -> int:
+    # Index in the original text of its i-th letter
+    shift = 0
+    for pos, run in skeleton:
+        if pos - shift > i:
+            break
+        shift += len(run)
+    return i + shift
+
+
+class _LayoutStream:
+    # Streaming counterpart of _split_layout/_merge_layout. The input text is
+    # written out as it arrives, with each letter slot taking the next cipher
+    # letter. Cipher letters may lag behind (an unfinished block or digram);
+    # the text from the first unfilled slot on is then held back. They may
+    # also run ahead (Playfair's filler X): the surplus waits in a queue and,
+    # exactly like the whole-string API, whatever is left ends up at the end.
+
+    def __init__(self, writer: TextIO) -> None:
+        self.writer = writer
+        self.held = ""
+        self.queue: Deque[str] = collections.deque()
+        self.queued = 0
+        self.written = 0
+
+    def __take(self, k: int) -> str:
+        pieces: List[str] = []
+        self.queued -= k
+        while k:
+            head = self.queue.popleft()
+            if len(head) > k:
+                self.queue.appendleft(head[k:])
+                head = head[:k]
+            pieces.append(head)
+            k -= len(head)
+        return "".join(pieces)
+
+    def _emit(self, text: str) -> None:
+        self.written += self.writer.write(text)
+
+    @_phase("reinsert")
+    def push(self, text: str, cipher_letters: str) -> None:
+        if cipher_letters:
+            self.queue.append(cipher_letters)
+            self.queued += len(cipher_letters)
+
+        held = self.held + text
+        letters, skeleton = _split_layout(held)
+        if len(letters) <= self.queued:
+            self.held = ""
+            self._emit(_merge_layout(self.__take(len(letters)), skeleton))
+        else:
+            cut = _letter_offset(skeleton, self.queued)
+            self.held = held[cut:]
+            prefix = [(pos, run) for pos, run in skeleton if pos < cut]
+            self._emit(_merge_layout(self.__take(self.queued), prefix))
+
+    @_phase("reinsert")
+    def close(self, cipher_letters: str = "") -> int:
+        self.push("", cipher_letters)
+        # Surplus letters go after the last symbol, as in _merge_layout
+        self._emit(self.held + self.__take(self.queued))
+        self.held = ""
+        return self.written
+
+
+# ---------------------------------------------------------------------------
+# 0e) Parallel helpers
+# ---------------------------------------------------------------------------
+
+# Inputs shorter than this are not worth shipping to worker processes
+PARALLEL_MIN_CHARS = 1 << 20
+
+_WHITESPACE = re.compile(r"\s")
+
+
+def _worker_count(workers: Optional[int]) -> int:
+    return workers or os.cpu_count() or 1
+
 
-        return "".join(result_chars)
+@_phase("transform")
+def _parallel_map(fn: Callable[..., Any], jobs: List[tuple], workers: Optional[int]) -> List[Any]:
+    # fn(*job) for every job, in order; across a process pool when it helps
+    workers = _worker_count(workers)
+    if workers == 1 or len(jobs) <= 1:
+        return [fn(*job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+        return list(pool.map(fn, *zip(*jobs)))
+
+
+def _aligned_slices(text: str, parts: int, align: int) -> List[str]:
+    # Split into about `parts` slices whose lengths are multiples of `align`
+    step = -(-len(text) // parts)
+    step += -step % align
+    return [text[i:i + step] for i in range(0, len(text), step)]
+
+
+def _whitespace_slices(text: str, parts: int) -> List[str]:
+    # Split into about `parts` slices, each ending right after a whitespace
+    # character so that case folding never sees a word cut in half
+    step = -(-len(text) // parts)
+    pieces: List[str] = []
+    start = 0
+    while start < len(text):
+        m = _WHITESPACE.search(text, start + step)
+        end = m.end() if m else len(text)
+        pieces.append(text[start:end])
+        start = end
+    return pieces
+
+
+def _translate_piece(text: str, m: int, c: int, decrypt: bool) -> str:
+    return _translate(text, _affine_table(m, c, decrypt), decrypt)
+
+
+@_phase("transform")
+def _translate_text(text: str, m: int, c: int, decrypt: bool, parallel: bool,
+                    workers: Optional[int]) -> str:
+    if parallel and len(text) >= PARALLEL_MIN_CHARS:
+        pieces = _whitespace_slices(text, _worker_count(workers))
+        return "".join(_parallel_map(_translate_piece, [(p, m, c, decrypt) for p in pieces], workers))
+    return _translate_piece(text, m, c, decrypt)
+
+
+# ---------------------------------------------------------------------------
+# 0f) Bytes helpers
+# ---------------------------------------------------------------------------
+
+# bytes, bytearray, memoryview, mmap, ...
+BytesLike = Union[bytes, bytearray, memoryview]
+
+
+def _bytes_text(data: BytesLike) -> str:
+    # Latin-1 maps every byte to one code point, so layout positions carry
+    # over unchanged; only A-Z / a-z are letters (_split_ascii_layout), every
+    # other byte is passed through as a symbol
+    return str(data, "latin-1")
+
+
+def _emit_bytes(result: bytes, out: Optional[BytesLike]) -> Union[bytes, int]:
+    # Return the result, or copy it into the caller's buffer and return its length
+    if out is None:
+        return result
+    if len(out) < len(result):
+        raise ValueError(f"Output buffer too small: {len(result)} bytes needed.")
+    memoryview(out)[:len(result)] = result
+    return len(result)
+
+
+@_phase("transform")
+def _translate_bytes(data: BytesLike, byte_table: bytes, out: Optional[BytesLike]) -> Union[bytes, int]:
+    # Letter substitution never changes the length, so the output can be
+    # written chunk by chunk into out (which may be data itself) and at most
+    # one chunk is ever copied
+    if out is None:
+        return bytes(data).translate(byte_table)
+    src = memoryview(data)
+    dst = memoryview(out)
+    n = len(src)
+    if len(dst) < n:
+        raise ValueError(f"Output buffer too small: {n} bytes needed.")
+    for start in range(0, n, CHUNK_SIZE):
+        end = min(start + CHUNK_SIZE, n)
+        dst[start:end] = bytes(src[start:end]).translate(byte_table)
+    return n
+
+
+# ---------------------------------------------------------------------------
+# 1) Caesar Cipher
+# ---------------------------------------------------------------------------
+
+class CaesarCipher:
+    def __init__(self, key: int = 3) -> None:
+        self.key = key
+
+    @_operation()
+    def encrypt(self, plain_text: str, parallel: bool = False, workers: Optional[int] = None) -> str:
+        # Caesar is the affine map x -> x + key
+        return _translate_text(plain_text, 1, self.key, False, parallel, workers)
+
+    @_operation()
+    def decrypt(self, cipher_text: str, parallel: bool = False, workers: Optional[int] = None) -> str:
+        # Reverse shift by key
+        return _translate_text(cipher_text, 1, -self.key, True, parallel, workers)
+
+    @_operation()
+    def encrypt_stream(self, reader: TextIO, writer: TextIO, chunk_size: int = CHUNK_SIZE) -> int:
+        return _translate_stream(reader, writer, _affine_table(1, self.key, False), False, chunk_size)
+
+    @_operation()
+    def decrypt_stream(self, reader: TextIO, writer: TextIO, chunk_size: int = CHUNK_SIZE) -> int:
+        return _translate_stream(reader, writer, _affine_table(1, -self.key, True), True, chunk_size)
+
+    @_operation()
+    def encrypt_bytes(self, data: BytesLike, out: Optional[BytesLike] = None) -> Union[bytes, int]:
+        return _translate_bytes(data, _affine_table(1, self.key, False).byte_table, out)
+
+    @_operation()
+    def decrypt_bytes(self, data: BytesLike, out: Optional[BytesLike] = None) -> Union[bytes, int]:
+        return _translate_bytes(data, _affine_table(1, -self.key, True).byte_table, out)
 
 
 # ---------------------------------------------------------------------------
@@ -61,391 +799,1260 @@ class AffineCipher:
         self.key = key
 
     def _a_inv(self) -> int:
-        a = self.key[0]
-        return pow(a, -1, 26)
+        a = self.key[0] % 26
+        return _AFFINE_INVERSE_CACHE.get(a, lambda: pow(a, -1, 26))
 
-    def encrypt(self, plain_text: str) -> str:
-        plain_text = plain_text.lower()
+    @_operation()
+    def encrypt(self, plain_text: str, parallel: bool = False, workers: Optional[int] = None) -> str:
         a, b = self.key
-        result_chars: List[str] = []
-
-        for ch in plain_text:
-            if ch.isalpha():
-                x = ord(ch) - ord('a')
-                y = (a * x + b) % 26
-                out_ch = chr(y + ord('A'))
-                result_chars.append(out_ch)
-            else:
-                result_chars.append(ch)
+        return _translate_text(plain_text, a, b, False, parallel, workers)
 
-        return "".join(result_chars)
+    @_operation()
+    def decrypt(self, cipher_text: str, parallel: bool = False, workers: Optional[int] = None) -> str:
+        a, b = self.key
+        a_inv = self._a_inv()
+        # Reverse affine: a_inv * (x - b) = a_inv * x - a_inv * b
+        return _translate_text(cipher_text, a_inv, -a_inv * b, True, parallel, workers)
 
-    def decrypt(self, cipher_text: str) -> str:
-        cipher_text = cipher_text.upper()
+    @_operation()
+    def encrypt_stream(self, reader: TextIO, writer: TextIO, chunk_size: int = CHUNK_SIZE) -> int:
+        a, b = self.key
+        return _translate_stream(reader, writer, _affine_table(a, b, False), False, chunk_size)
+
+    @_operation()
+    def decrypt_stream(self, reader: TextIO, writer: TextIO, chunk_size: int = CHUNK_SIZE) -> int:
         a, b = self.key
         a_inv = self._a_inv()
-        result_chars: List[str] = []
-
-        for ch in cipher_text:
-            if ch.isalpha():
-                x = ord(ch) - ord('A')
-                # Reverse affine: a_inv * (x - b)
-                y = (a_inv * (x - b)) % 26
-                out_ch = chr(y + ord('a'))
-                result_chars.append(out_ch)
-            else:
-                result_chars.append(ch)
+        return _translate_stream(reader, writer, _affine_table(a_inv, -a_inv * b, True), True, chunk_size)
 
-        return "".join(result_chars)
+    @_operation()
+    def encrypt_bytes(self, data: BytesLike, out: Optional[BytesLike] = None) -> Union[bytes, int]:
+        a, b = self.key
+        return _translate_bytes(data, _affine_table(a, b, False).byte_table, out)
+
+    @_operation()
+    def decrypt_bytes(self, data: BytesLike, out: Optional[BytesLike] = None) -> Union[bytes, int]:
+        a, b = self.key
+        a_inv = self._a_inv()
+        return _translate_bytes(data, _affine_table(a_inv, -a_inv * b, True).byte_table, out)
 
 
 # ---------------------------------------------------------------------------
 # 3) Playfair Cipher
 # ---------------------------------------------------------------------------
 
-class PlayfairCipher:
-    def __init__(self, key: str = "MONARCHY") -> None:
-        self.keymatrix: Tuple[Tuple[str, ...], ...] = self.__create_keymatrix(key)
+_INSERTED_X = re.compile(r"(?<=(.))X(?=\1)", re.DOTALL)
+_DOUBLED_LETTER = re.compile(r"(?=(.)\1)", re.DOTALL)
+_DIGRAM = re.compile(r"..", re.DOTALL)
 
-    # ----- Key matrix creation helpers -----
+Keymatrix = Tuple[Tuple[str, ...], ...]
 
-    def __create_keymatrix(self, key: str) -> Tuple[Tuple[str, ...], ...]:
-        key = key.upper()
 
-        # Remove duplicates while preserving order
-        seen = set()
-        unique_chars: List[str] = []
-        for ch in key:
-            if ch.isalpha() and ch not in seen:
-                seen.add(ch)
-                unique_chars.append(ch)
+class _PlayfairSchedule(NamedTuple):
+    keymatrix: Keymatrix
+    positions: Dict[str, Tuple[int, int]]
+    encrypt_table: Dict[str, str]
+    decrypt_table: Dict[str, str]
 
-        # Append remaining letters
-        for code in range(ord('A'), ord('Z') + 1):
-            ch = chr(code)
-            if ch not in seen:
-                seen.add(ch)
-                unique_chars.append(ch)
 
-        # Remove J (I/J combined)
-        if 'J' in unique_chars:
-            unique_chars.remove('J')
+def _create_keymatrix(key: str) -> Keymatrix:
+    key = key.upper()
 
-        # Now we must have 25 letters
-        # Build 5x5 matrix
-        matrix: List[Tuple[str, ...]] = []
-        for i in range(0, 25, 5):
-            matrix.append(tuple(unique_chars[i:i + 5]))
+    # Remove duplicates while preserving order
+    seen = set()
+    unique_chars: List[str] = []
+    for ch in key:
+        if ch.isalpha() and ch not in seen:
+            seen.add(ch)
+            unique_chars.append(ch)
 
-        return tuple(matrix)
+    # Append remaining letters
+    for code in range(ord('A'), ord('Z') + 1):
+        ch = chr(code)
+        if ch not in seen:
+            seen.add(ch)
+            unique_chars.append(ch)
 
-    # ----- Text preprocessing helpers -----
+    # Remove J (I/J combined)
+    if 'J' in unique_chars:
+        unique_chars.remove('J')
 
-    def __create_digrams(self, text: str) -> List[str]:
-        digrams: List[str] = []
-        i = 0
+    # Now we must have 25 letters
+    # Build 5x5 matrix
+    matrix: List[Tuple[str, ...]] = []
+    for i in range(0, 25, 5):
+        matrix.append(tuple(unique_chars[i:i + 5]))
 
-        while i < len(text):
-            first = text[i]
+    return tuple(matrix)
 
-            # second is next character or X if none left
-            second = text[i + 1] if (i + 1) < len(text) else "X"
 
-            if first == second:
-                # Duplicate letter -> insert X
-                digrams.append(first + "X")
-                i += 1
-            else:
-                digrams.append(first + second)
-                i += 2
-
-        return digrams
-
-    def __find_position(self, ch: str) -> Tuple[int, int]:
-        for r in range(5):
-            for c in range(5):
-                if self.keymatrix[r][c] == ch:
-                    return (r, c)
-        raise ValueError(f"Character {ch} not found in key matrix.")
-
-    def __remove_inserted_x(self, chars: List[str]) -> None:
-        i = 1
-        while i < len(chars) - 1:
-            if chars[i] == "X" and chars[i - 1] == chars[i + 1]:
-                del chars[i]
-            else:
-                i += 1
+def _playfair_schedule(key: str) -> _PlayfairSchedule:
+    return _PLAYFAIR_CACHE.get(key, lambda: _build_playfair_schedule(key))
 
-    # ----- Public encrypt/decrypt -----
 
-    def encrypt(self, plain_text: str) -> str:
-        # 1) Save non-letter symbols with their indices
-        symbols: List[Tuple[int, str]] = []
-        for i, ch in enumerate(plain_text):
-            if not ch.isalpha():
-                symbols.append((i, ch))
-
-        # 2) Keep only letters
-        letters_only = []
-        for ch in plain_text:
-            if ch.isalpha():
-                letters_only.append(ch)
-
-        cleaned = "".join(letters_only).upper().replace("J", "I")
-
-        # 3) Digram creation
-        digrams = self.__create_digrams(cleaned)
+def _build_playfair_schedule(key: str) -> _PlayfairSchedule:
+    keymatrix = _create_keymatrix(key)
 
-        # 4) Encrypt digrams
-        cipher_chars: List[str] = []
-        for dg in digrams:
-            first, second = dg[0], dg[1]
-
-            r1, c1 = self.__find_position(first)
-            r2, c2 = self.__find_position(second)
+    # letter -> (row, col)
+    positions: Dict[str, Tuple[int, int]] = {}
+    for r in range(5):
+        for c in range(5):
+            positions[keymatrix[r][c]] = (r, c)
 
+    # Every one of the 25 x 25 digrams, mapped in both directions
+    encrypt_table: Dict[str, str] = {}
+    decrypt_table: Dict[str, str] = {}
+    for first, (r1, c1) in positions.items():
+        for second, (r2, c2) in positions.items():
             if r1 == r2:
-                # Same row: shift LEFT (c-1) in your original code
-                cipher_chars.append(self.keymatrix[r1][(c1 - 1) % 5])
-                cipher_chars.append(self.keymatrix[r2][(c2 - 1) % 5])
-
+                # Same row: encrypt shifts LEFT (c-1), decrypt RIGHT (c+1)
+                enc = keymatrix[r1][(c1 - 1) % 5] + keymatrix[r2][(c2 - 1) % 5]
+                dec = keymatrix[r1][(c1 + 1) % 5] + keymatrix[r2][(c2 + 1) % 5]
             elif c1 == c2:
-                # Same column: shift UP (r-1) in your original code
-                cipher_chars.append(self.keymatrix[(r1 - 1) % 5][c1])
-                cipher_chars.append(self.keymatrix[(r2 - 1) % 5][c2])
-
+                # Same column: encrypt shifts UP (r-1), decrypt DOWN (r+1)
+                enc = keymatrix[(r1 - 1) % 5][c1] + keymatrix[(r2 - 1) % 5][c2]
+                dec = keymatrix[(r1 + 1) % 5][c1] + keymatrix[(r2 + 1) % 5][c2]
             else:
-                # Rectangle: swap columns
-                cipher_chars.append(self.keymatrix[r1][c2])
-                cipher_chars.append(self.keymatrix[r2][c1])
+                # Rectangle: swap columns (its own inverse)
+                enc = dec = keymatrix[r1][c2] + keymatrix[r2][c1]
+            encrypt_table[first + second] = enc
+            decrypt_table[first + second] = dec
+
+    return _PlayfairSchedule(keymatrix, positions, encrypt_table, decrypt_table)
+
+
+class _FillerXWriter:
+    # Removes filler X from merged decrypt output as it streams past, then
+    # lowercases it. An X only depends on its two neighbours, so just the
+    # last two characters are carried: the one before (already written)
+    # and the last one (undecided until more text or close()).
+
+    def __init__(self, writer: TextIO) -> None:
+        self.writer = writer
+        self.tail = ""
+
+    def write(self, text: str) -> int:
+        if not text:
+            return 0
+        work = self.tail + text
+        kept = _INSERTED_X.sub("", work)
+        start = 1 if len(self.tail) == 2 else 0
+        self.tail = work[-2:]
+        return self.writer.write(kept[start:-1].lower())
+
+    def close(self) -> int:
+        last, self.tail = self.tail[-1:], ""
+        return self.writer.write(last.lower())
+
+
+@_phase("transform")
+def _playfair_substitute(digrams: List[str], table: Dict[str, str], positions: Dict[str, Tuple[int, int]]) -> str:
+    try:
+        return "".join(map(table.__getitem__, digrams))
+    except KeyError as e:
+        dg = e.args[0]
+        ch = dg[0] if dg[0] not in positions else dg[1]
+        raise ValueError(f"Character {ch} not found in key matrix.") from None
+
+
+@_phase("preprocess")
+def _create_digrams(text: str, final: bool = True) -> Tuple[List[str], str]:
+    # Pairs only change where a letter repeats inside a digram (insert
+    # X) or one is left over at the end (pad with X), so only those
+    # spots are visited; the stretches between them are sliced as is.
+    # With final=False a left-over letter is returned instead of padded,
+    # so the next chunk of a stream can pair it up.
+    pieces: List[str] = []
+    start = 0
+    leftover = ""
+
+    for m in _DOUBLED_LETTER.finditer(text):
+        i = m.start()
+        if (i - start) % 2 == 0:
+            # Duplicate letter -> insert X
+            pieces.append(text[start:i + 1])
+            pieces.append("X")
+            start = i + 1
+
+    pieces.append(text[start:])
+    if (len(text) - start) % 2 == 1:
+        if final:
+            pieces.append("X")
+        else:
+            leftover = pieces.pop()[-1]
+            pieces.append(text[start:-1])
+
+    return _DIGRAM.findall("".join(pieces)), leftover
+
+
+# Letter code -> uppercase letter, with J folded into I
+_PLAYFAIR_LETTERS = bytes(ord('A') + (8 if b % 26 == 9 else b % 26) for b in range(256))
+
+
+def _playfair_letters(stream: LetterStream) -> str:
+    # Uppercase letters with J as I
+    if stream.upper:
+        return stream.upper.replace("J", "I")
+    return stream.codes.translate(_PLAYFAIR_LETTERS).decode("ascii")
+
+
+def _playfair_translate(pairs: str, key: str, decrypt: bool) -> str:
+    # Worker-process entry point: substitute a run of ready-made digrams
+    schedule = _playfair_schedule(key)
+    table = schedule.decrypt_table if decrypt else schedule.encrypt_table
+    return _playfair_substitute(_DIGRAM.findall(pairs), table, schedule.positions)
 
-        # 5) Reinsert symbols
-        for pos, sym in symbols:
-            cipher_chars.insert(pos, sym)
 
-        return "".join(cipher_chars)
+class PlayfairCipher:
+    def __init__(self, key: str = "MONARCHY") -> None:
+        self.key = key
+        # Key schedules are cached per keyword, so rebuilding a cipher is free
+        schedule = _playfair_schedule(key)
+        self.keymatrix: Keymatrix = schedule.keymatrix
+        self.positions = schedule.positions
+        self._encrypt_table = schedule.encrypt_table
+        self._decrypt_table = schedule.decrypt_table
 
-    def decrypt(self, cipher_text: str) -> str:
-        # 1) Save non-letter symbols
-        symbols: List[Tuple[int, str]] = []
-        for i, ch in enumerate(cipher_text):
-            if not ch.isalpha():
-                symbols.append((i, ch))
+    # ----- Text preprocessing helpers -----
 
-        # Remove non-letters
-        letters_only = []
-        for ch in cipher_text:
-            if ch.isalpha():
-                letters_only.append(ch)
+    def __substitute(self, digrams: List[str], table: Dict[str, str]) -> str:
+        return _playfair_substitute(digrams, table, self.positions)
 
-        cleaned = "".join(letters_only).upper().replace("J", "I")
+    def __translate(self, digrams: List[str], decrypt: bool, parallel: bool, workers: Optional[int]) -> str:
+        table = self._decrypt_table if decrypt else self._encrypt_table
+        if parallel and 2 * len(digrams) >= PARALLEL_MIN_CHARS:
+            # Digrams are fixed up front, so the slices are independent
+            pieces = _aligned_slices("".join(digrams), _worker_count(workers), 2)
+            jobs = [(p, self.key, decrypt) for p in pieces]
+            return "".join(_parallel_map(_playfair_translate, jobs, workers))
+        return self.__substitute(digrams, table)
 
-        # 3) Split into digrams
-        digrams = []
-        for i in range(0, len(cleaned), 2):
-            digrams.append(cleaned[i:i + 2])
+    @_phase("render")
+    def __remove_inserted_x(self, text: str) -> str:
+        # An X is filler when its neighbours are equal; deleting one never
+        # changes the left neighbour's value, so every X can be checked
+        # against the original text independently
+        return _INSERTED_X.sub("", text)
 
-        # 4) Decrypt digrams
-        plain_chars: List[str] = []
-        for dg in digrams:
-            first, second = dg[0], dg[1]
+    # ----- Letter stream encrypt/decrypt -----
 
-            r1, c1 = self.__find_position(first)
-            r2, c2 = self.__find_position(second)
+    def __encrypt(self, stream: LetterStream, parallel: bool = False,
+                  workers: Optional[int] = None) -> str:
+        cleaned = _playfair_letters(stream)
 
-            if r1 == r2:
-                # Same row: shift RIGHT (c+1) in your original code
-                plain_chars.append(self.keymatrix[r1][(c1 + 1) % 5])
-                plain_chars.append(self.keymatrix[r2][(c2 + 1) % 5])
+        # 3) Digram creation
+        digrams, _ = _create_digrams(cleaned)
 
-            elif c1 == c2:
-                # Same column: shift DOWN (r+1) in your original code
-                plain_chars.append(self.keymatrix[(r1 + 1) % 5][c1])
-                plain_chars.append(self.keymatrix[(r2 + 1) % 5][c2])
+        # 4) Encrypt digrams, one table lookup each
+        cipher_chars = self.__translate(digrams, False, parallel, workers)
 
-            else:
-                # Rectangle: swap columns
-                plain_chars.append(self.keymatrix[r1][c2])
-                plain_chars.append(self.keymatrix[r2][c1])
+        # 5) Reinsert symbols
+        return _place_letters(cipher_chars, stream.layout)
+
+    def __decrypt(self, stream: LetterStream, parallel: bool = False,
+                  workers: Optional[int] = None) -> str:
+        # Plaintext is returned in uppercase; callers lowercase it
+        cleaned = _playfair_letters(stream)
+
+        # 3) Split into digrams
+        if len(cleaned) % 2 == 1:
+            raise ValueError("Playfair ciphertext must contain an even number of letters.")
+        digrams = _DIGRAM.findall(cleaned)
+
+        # 4) Decrypt digrams, one table lookup each
+        plain_chars = self.__translate(digrams, True, parallel, workers)
 
         # 5) Reinsert symbols
-        for pos, sym in symbols:
-            plain_chars.insert(pos, sym)
+        merged = _place_letters(plain_chars, stream.layout)
 
         # 6) Remove inserted X's
-        self.__remove_inserted_x(plain_chars)
+        return self.__remove_inserted_x(merged)
+
+    # ----- Public encrypt/decrypt -----
 
-        return "".join(plain_chars).lower()
+    @_operation()
+    def encrypt(self, plain_text: str, parallel: bool = False, workers: Optional[int] = None) -> str:
+        # 1) + 2) Split into letter codes and non-letter layout
+        return self.__encrypt(_letter_stream(plain_text), parallel, workers)
+
+    @_operation()
+    def decrypt(self, cipher_text: str, parallel: bool = False, workers: Optional[int] = None) -> str:
+        # 1) + 2) Split into letter codes and non-letter layout
+        return self.__decrypt(_letter_stream(cipher_text), parallel, workers).lower()
+
+    @_operation()
+    def encrypt_bytes(self, data: BytesLike, out: Optional[BytesLike] = None) -> Union[bytes, int]:
+        # Filler X's change the length, so out must allow for them
+        return _emit_bytes(self.__encrypt(_letter_stream(data)).encode("latin-1"), out)
+
+    @_operation()
+    def decrypt_bytes(self, data: BytesLike, out: Optional[BytesLike] = None) -> Union[bytes, int]:
+        # bytes.lower() only touches A-Z, so other bytes pass through as is
+        return _emit_bytes(self.__decrypt(_letter_stream(data)).encode("latin-1").lower(), out)
+
+    @_operation()
+    def encrypt_stream(self, reader: TextIO, writer: TextIO, chunk_size: int = CHUNK_SIZE) -> int:
+        out = _LayoutStream(writer)
+        pending = ""
+        for chunk in _iter_chunks(reader, chunk_size):
+            cleaned = pending + _playfair_letters(_letter_stream(chunk))
+            digrams, pending = _create_digrams(cleaned, final=False)
+            out.push(chunk, self.__substitute(digrams, self._encrypt_table))
+
+        digrams, _ = _create_digrams(pending)
+        return out.close(self.__substitute(digrams, self._encrypt_table))
+
+    @_operation()
+    def decrypt_stream(self, reader: TextIO, writer: TextIO, chunk_size: int = CHUNK_SIZE) -> int:
+        x_writer = _FillerXWriter(writer)
+        out = _LayoutStream(x_writer)
+        pending = ""
+        for chunk in _iter_chunks(reader, chunk_size):
+            cleaned = pending + _playfair_letters(_letter_stream(chunk))
+            even = len(cleaned) - len(cleaned) % 2
+            pending = cleaned[even:]
+            out.push(chunk, self.__substitute(_DIGRAM.findall(cleaned[:even]), self._decrypt_table))
+
+        if pending:
+            raise ValueError("Playfair ciphertext must contain an even number of letters.")
+        return out.close() + x_writer.close()
 
 
 # ---------------------------------------------------------------------------
-# 4) Hill Cipher (2x2)
+# 4) Hill Cipher (n x n)
 # ---------------------------------------------------------------------------
 
+Matrix = List[List[int]]
+
+# Below this many letters the NumPy round trip costs more than it saves
+_NUMPY_MIN_LETTERS = 64
+
+
+def _inverse_mod_p(mat: Matrix, p: int) -> Matrix:
+    # Gauss-Jordan elimination over the field Z/p
+    n = len(mat)
+    aug = [[x % p for x in row] + [int(i == j) for j in range(n)] for i, row in enumerate(mat)]
+
+    for col in range(n):
+        pivot = next((r for r in range(col, n) if aug[r][col]), None)
+        if pivot is None:
+            raise ValueError("Hill key matrix is not invertible mod 26.")
+        aug[col], aug[pivot] = aug[pivot], aug[col]
+
+        scale = pow(aug[col][col], -1, p)
+        aug[col] = [(x * scale) % p for x in aug[col]]
+
+        for r in range(n):
+            factor = aug[r][col]
+            if r != col and factor:
+                aug[r] = [(x - factor * y) % p for x, y in zip(aug[r], aug[col])]
+
+    return [row[n:] for row in aug]
+
+
+def _inverse_mod26(mat: Matrix) -> Matrix:
+    # Z/26 is not a field, but Z/26 = Z/2 x Z/13 is a product of two. A matrix
+    # is invertible mod 26 iff it is invertible mod 2 and mod 13 (i.e. its
+    # determinant shares no factor with 26); the two inverses are recombined
+    # with the CRT: x = 13 * (x mod 2) + 14 * (x mod 13)  (mod 26).
+    inv2 = _inverse_mod_p(mat, 2)
+    inv13 = _inverse_mod_p(mat, 13)
+    return [[(13 * a + 14 * b) % 26 for a, b in zip(row2, row13)] for row2, row13 in zip(inv2, inv13)]
+
+
+_X_CODE = bytes([ord('X') - ord('A')])
+
+
+@_phase("transform")
+def _hill_codes(codes: bytes, key: Matrix) -> bytes:
+    # Transform a whole number of blocks of letter codes (row vector times
+    # key, mod 26); with NumPy one matmul covers every block
+    n = len(key)
+    if np is not None and len(codes) >= _NUMPY_MIN_LETTERS:
+        blocks = np.frombuffer(codes, dtype=np.uint8).reshape(-1, n).astype(np.int32)
+        out = (blocks @ (np.array(key, dtype=object) % 26).astype(np.int32)) % 26
+        return out.astype(np.uint8).tobytes()
+
+    cols = list(zip(*key))
+    out_codes = bytearray()
+    for i in range(0, len(codes), n):
+        block = codes[i:i + n]
+        out_codes.extend([sum(map(mul, block, col)) % 26 for col in cols])
+    return bytes(out_codes)
+
+
+def _hill_apply(cleaned: str, key: Matrix) -> str:
+    # Same as _hill_codes on a string of uppercase letters
+    return _code_letters(_hill_codes(_letter_codes(cleaned), key))
+
+
+def _solve_mod_p(rows: Iterator[Tuple[List[int], List[int]]], n: int, p: int) -> Optional[Matrix]:
+    # Solve P K = C over Z/p one block equation at a time, keeping the rows
+    # seen so far in reduced echelon form. Stops as soon as n independent
+    # rows are found, which for real text is almost always within the first
+    # few blocks; None if the blocks never span Z/p^n.
+    basis: Dict[int, Tuple[List[int], List[int]]] = {}
+    for row, rhs in rows:
+        row = [x % p for x in row]
+        rhs = [x % p for x in rhs]
+        for col, (b_row, b_rhs) in basis.items():
+            f = row[col]
+            if f:
+                row = [(x - f * y) % p for x, y in zip(row, b_row)]
+                rhs = [(x - f * y) % p for x, y in zip(rhs, b_rhs)]
+
+        col = next((i for i, x in enumerate(row) if x), None)
+        if col is None:
+            continue  # linearly dependent on earlier blocks
+        scale = pow(row[col], -1, p)
+        row = [(x * scale) % p for x in row]
+        rhs = [(x * scale) % p for x in rhs]
+
+        for pivot, (b_row, b_rhs) in list(basis.items()):
+            f = b_row[col]
+            if f:
+                basis[pivot] = ([(x - f * y) % p for x, y in zip(b_row, row)],
+                                [(x - f * y) % p for x, y in zip(b_rhs, rhs)])
+        basis[col] = (row, rhs)
+
+        if len(basis) == n:
+            # The basis is now the identity, so row i of K is its right-hand side
+            return [basis[i][1] for i in range(n)]
+    return None
+
+
+# Blocks checked in pure Python before the full vectorized verification
+_HILL_PRECHECK_BLOCKS = 32
+
+
+@_phase("transform")
+def _hill_known_plaintext(p_clean: str, c_clean: str, n: int, offset: int, phase: int) -> Optional[Matrix]:
+    # plaintext letter i lines up with ciphertext letter offset + i; blocks
+    # start at plaintext positions phase, phase + n, ...
+    stop = phase + (min(len(p_clean), len(c_clean) - offset) - phase) // n * n
+    if stop - phase < n * n:
+        return None
+
+    def blocks() -> Iterator[Tuple[List[int], List[int]]]:
+        base = ord('A')
+        for i in range(phase, stop, n):
+            yield ([ord(ch) - base for ch in p_clean[i:i + n]],
+                   [ord(ch) - base for ch in c_clean[offset + i:offset + i + n]])
+
+    # Gaussian elimination mod 2 and mod 13, recombined with the CRT
+    key2 = _solve_mod_p(blocks(), n, 2)
+    key13 = _solve_mod_p(blocks(), n, 13) if key2 is not None else None
+    if key13 is None:
+        return None
+    key = [[(13 * a + 14 * b) % 26 for a, b in zip(r2, r13)] for r2, r13 in zip(key2, key13)]
+
+    # Verify on a short prefix first, then on every block in one pass
+    head = phase + min(stop - phase, n * _HILL_PRECHECK_BLOCKS)
+    if _hill_apply(p_clean[phase:head], key) != c_clean[offset + phase:offset + head]:
+        return None
+    if _hill_apply(p_clean[phase:stop], key) != c_clean[offset + phase:offset + stop]:
+        return None
+    return key
+
+
 class HillCipher:
     def __init__(self, key: List[List[int]] = [[5, 8], [17, 13]]) -> None:
         self.key = key
 
-    # ----- Encoding helpers -----
+    # ----- Modular arithmetic helpers -----
 
-    def __to_numbers(self, text: str) -> List[int]:
-        nums: List[int] = []
-        for ch in text:
-            nums.append(ord(ch) - ord('A'))
-        return nums
+    def __inverse_mat(self, mat: List[List[int]]) -> Tuple[Tuple[int, ...], ...]:
+        # ValueError if not invertible. Cached as tuples so callers of the
+        # shared entry cannot modify it.
+        key = tuple(tuple(row) for row in mat)
+        return _HILL_INVERSE_CACHE.get(key, lambda: tuple(tuple(row) for row in _inverse_mod26(mat)))
+
+    def __apply(self, codes: bytes, key: List[List[int]], parallel: bool = False,
+                workers: Optional[int] = None) -> bytes:
+        # codes must already be a whole number of blocks
+        if parallel and len(codes) >= PARALLEL_MIN_CHARS:
+            # ECB-style blocks are independent: split on block boundaries
+            pieces = _aligned_slices(codes, _worker_count(workers), len(key))
+            return b"".join(_parallel_map(_hill_codes, [(p, key) for p in pieces], workers))
+        return _hill_codes(codes, key)
 
-    def __to_letters(self, nums: List[int]) -> List[str]:
-        letters: List[str] = []
-        for n in nums:
-            letters.append(chr(n + ord('A')))
-        return letters
+    # ----- Public encrypt/decrypt -----
 
-    # ----- Modular arithmetic helpers -----
+    def inverse_key(self) -> List[List[int]]:
+        # Decryption matrix; ValueError if the key is not invertible mod 26
+        return [list(row) for row in self.__inverse_mat(self.key)]
 
-    def __mod_product(self, A: List[List[int]], v: List[int]) -> List[int]:
-        v0, v1 = v[0], v[1]
-
-        u0 = (v0 * A[0][0] + v1 * A[1][0]) % 26
-        u1 = (v0 * A[0][1] + v1 * A[1][1]) % 26
-
-        return [u0, u1]
-
-    def __mod_matmul(self, A: List[List[int]], B: List[List[int]]) -> List[List[int]]:
-        return [
-            [
-                (A[0][0] * B[0][0] + A[0][1] * B[1][0]) % 26,
-                (A[0][0] * B[0][1] + A[0][1] * B[1][1]) % 26,
-            ],
-            [
-                (A[1][0] * B[0][0] + A[1][1] * B[1][0]) % 26,
-                (A[1][0] * B[0][1] + A[1][1] * B[1][1]) % 26,
-            ],
-        ]
-
-    def __inverse_mat(self, mat: List[List[int]]) -> List[List[int]]:
-        a, b = mat[0][0], mat[0][1]
-        c, d = mat[1][0], mat[1][1]
-
-        det = (a * d - b * c) % 26
-        det_inv = pow(det, -1, 26)  # ValueError if not invertible
-
-        inv = [
-            [(d * det_inv) % 26, (-b * det_inv) % 26],
-            [(-c * det_inv) % 26, (a * det_inv) % 26],
-        ]
-        return inv
-
-    # ----- Cracking helpers -----
-
-    def __try_crack(self, plain_mat: List[List[int]], cipher_mat: List[List[int]]) -> Optional[List[List[int]]]:
-        try:
-            plain_inv = self.__inverse_mat(plain_mat)
-            key = self.__mod_matmul(plain_inv, cipher_mat)
-            return key
-        except Exception:
-            return None
+    def __encrypt(self, stream: LetterStream, parallel: bool = False,
+                  workers: Optional[int] = None) -> str:
+        n = len(self.key)
+        codes = stream.codes
 
-    # ----- Public encrypt/decrypt -----
+        # 3) Pad with X up to a whole number of blocks
+        if len(codes) % n:
+            codes += _X_CODE * (n - len(codes) % n)
 
-    def encrypt(self, plain_text: str) -> str:
-        # 1) Save non-letter symbols
-        symbols: List[Tuple[int, str]] = []
-        for i, ch in enumerate(plain_text):
-            if not ch.isalpha():
-                symbols.append((i, ch))
-
-        # 2) Keep only letters and uppercase
-        letters = []
-        for ch in plain_text:
-            if ch.isalpha():
-                letters.append(ch)
-        cleaned = "".join(letters).upper()
-
-        # 3) Convert to numbers
-        plain_nums = self.__to_numbers(cleaned)
-
-        # 4) Pad if needed
-        if len(plain_nums) % 2 == 1:
-            plain_nums.append(23)  # X
-
-        # 5) Encrypt in blocks
-        cipher_nums: List[int] = []
-        for i in range(0, len(plain_nums), 2):
-            block = [plain_nums[i], plain_nums[i + 1]]
-            out_block = self.__mod_product(self.key, block)
-            cipher_nums.extend(out_block)
-
-        # 6) Convert back and reinsert symbols
-        cipher_letters = self.__to_letters(cipher_nums)
-        for pos, sym in symbols:
-            cipher_letters.insert(pos, sym)
-
-        return "".join(cipher_letters)
+        # 4) Encrypt all blocks
+        cipher_codes = self.__apply(codes, self.key, parallel, workers)
 
-    def decrypt(self, cipher_text: str) -> str:
+        # 5) Reinsert symbols
+        return _render(cipher_codes, stream.layout)
+
+    def __decrypt(self, stream: LetterStream, parallel: bool = False,
+                  workers: Optional[int] = None) -> str:
+        # Letters are returned in lowercase
+        n = len(self.key)
         key_inv = self.__inverse_mat(self.key)
 
-        # 2) Save non-letter symbols
-        symbols: List[Tuple[int, str]] = []
-        for i, ch in enumerate(cipher_text):
-            if not ch.isalpha():
-                symbols.append((i, ch))
-
-        # 3) Keep only letters and uppercase
-        letters = []
-        for ch in cipher_text:
-            if ch.isalpha():
-                letters.append(ch)
-        cleaned = "".join(letters).upper()
-
-        # 4) Convert to numbers
-        cipher_nums = self.__to_numbers(cleaned)
-
-        # 5) Decrypt blocks
-        plain_nums: List[int] = []
-        for i in range(0, len(cipher_nums), 2):
-            block = [cipher_nums[i], cipher_nums[i + 1]]
-            out_block = self.__mod_product(key_inv, block)
-            plain_nums.extend(out_block)
-
-        # 6) Convert back and reinsert symbols
-        plain_letters = self.__to_letters(plain_nums)
-        for pos, sym in symbols:
-            plain_letters.insert(pos, sym)
-
-        return "".join(plain_letters).lower()
-
-    def crack_key(self, plain_text: str, cipher_text: str) -> Optional[List[List[int]]]:
-        # Keep only letters and uppercase
-        p_letters = [ch for ch in plain_text if ch.isalpha()]
-        c_letters = [ch for ch in cipher_text if ch.isalpha()]
-
-        p_clean = "".join(p_letters).upper()
-        c_clean = "".join(c_letters).upper()
-
-        p_nums = self.__to_numbers(p_clean)
-        c_nums = self.__to_numbers(c_clean)
-
-        # Need at least 4 letters (2 blocks)
-        if len(p_nums) < 4 or len(c_nums) < 4:
-            return None
+        if len(stream.codes) % n:
+            raise ValueError(f"Hill ciphertext must contain a multiple of {n} letters.")
+
+        # 4) Decrypt all blocks
+        plain_codes = self.__apply(stream.codes, key_inv, parallel, workers)
+
+        # 5) Reinsert symbols
+        return _render(plain_codes, stream.layout, lower=True)
+
+    @_operation()
+    def encrypt(self, plain_text: str, parallel: bool = False, workers: Optional[int] = None) -> str:
+        # 1) + 2) Split into letter codes and non-letter layout
+        return self.__encrypt(_letter_stream(plain_text), parallel, workers)
+
+    @_operation()
+    def decrypt(self, cipher_text: str, parallel: bool = False, workers: Optional[int] = None) -> str:
+        # 1) + 2) Split into letter codes and non-letter layout
+        plain = self.__decrypt(_letter_stream(cipher_text), parallel, workers)
+        # Non-ASCII symbols are lowercased as well, as str.lower() always did
+        return plain if plain.isascii() else plain.lower()
+
+    @_operation()
+    def encrypt_bytes(self, data: BytesLike, out: Optional[BytesLike] = None) -> Union[bytes, int]:
+        # Padding may add up to n - 1 bytes at the end
+        return _emit_bytes(self.__encrypt(_letter_stream(data)).encode("latin-1"), out)
+
+    @_operation()
+    def decrypt_bytes(self, data: BytesLike, out: Optional[BytesLike] = None) -> Union[bytes, int]:
+        return _emit_bytes(self.__decrypt(_letter_stream(data)).encode("latin-1"), out)
+
+    def __stream(self, reader: TextIO, writer: TextIO, key: List[List[int]], decrypt: bool,
+                 chunk_size: int) -> int:
+        n = len(self.key)
+        out = _LayoutStream(_LowerWriter(writer) if decrypt else writer)
+        pending = b""
+        for chunk in _iter_chunks(reader, chunk_size):
+            codes = pending + _letter_stream(chunk).codes
+            whole = len(codes) - len(codes) % n
+            pending = codes[whole:]
+            out.push(chunk, _code_letters(self.__apply(codes[:whole], key)))
+
+        if pending:
+            if decrypt:
+                raise ValueError(f"Hill ciphertext must contain a multiple of {n} letters.")
+            pending += _X_CODE * (n - len(pending))
+        return out.close(_code_letters(self.__apply(pending, key)))
+
+    @_operation()
+    def encrypt_stream(self, reader: TextIO, writer: TextIO, chunk_size: int = CHUNK_SIZE) -> int:
+        return self.__stream(reader, writer, self.key, False, chunk_size)
+
+    @_operation()
+    def decrypt_stream(self, reader: TextIO, writer: TextIO, chunk_size: int = CHUNK_SIZE) -> int:
+        return self.__stream(reader, writer, self.__inverse_mat(self.key), True, chunk_size)
+
+    @_operation(inputs=2)
+    def crack_key(self, plain_text: str, cipher_text: str,
+                  offset: Optional[int] = 0) -> Optional[List[List[int]]]:
+        """Recover the key from a known plaintext/ciphertext pair.
+
+        The key size is taken from this instance (2x2 by default). offset is
+        the letter position in the ciphertext where the known plaintext
+        starts; pass None to search every position and block alignment.
+        Returns None unless exactly one key fits all of the text.
+        """
+        n = len(self.key)
+        p_clean = _letters_only(plain_text).upper()
+        c_clean = _letters_only(cipher_text).upper()
+
+        if offset is not None:
+            # Block boundaries fall on multiples of n in the ciphertext
+            _count_candidates(1)
+            return _hill_known_plaintext(p_clean, c_clean, n, offset, -offset % n)
+
+        for off in range(max(1, len(c_clean) - len(p_clean) + 1)):
+            # Try the aligned phase first, then the rest
+            for k in range(n):
+                _count_candidates(1)
+                key = _hill_known_plaintext(p_clean, c_clean, n, off, (k - off) % n)
+                if key is not None:
+                    return key
+        return None
+
 
-        key: Optional[List[List[int]]] = None
+# ---------------------------------------------------------------------------
+# 5) Batch API
+# ---------------------------------------------------------------------------
 
-        # Slide by 2 (block size) to keep alignment
-        for i in range(0, len(p_nums) - 3, 2):
-            plain_mat = [
-                [p_nums[i],     p_nums[i + 1]],
-                [p_nums[i + 2], p_nums[i + 3]],
-            ]
-            cipher_mat = [
-                [c_nums[i],     c_nums[i + 1]],
-                [c_nums[i + 2], c_nums[i + 3]],
-            ]
+CipherType = Union[type, Callable[[Any], Any]]
 
-            key_try = self.__try_crack(plain_mat, cipher_mat)
-            if key_try is not None:
-                key = key_try
-                break
 
+def _hashable_key(key: Any) -> Any:
+    # Hill keys are nested lists; anything unhashable is grouped by its repr
+    try:
+        hash(key)
         return key
+    except TypeError:
+        return repr(key)
+
+
+def _affine_batch(texts: List[str], m: int, c: int, decrypt: bool) -> List[str]:
+    # str.translate is context free on ASCII text, so every ASCII message of
+    # the group goes through a single translate call and is sliced back out.
+    # Other messages need case folding first and are translated one by one.
+    table = _affine_table(m, c, decrypt)
+    out = [_translate(t, table, decrypt) if not t.isascii() else "" for t in texts]
+    ascii_ids = [i for i, t in enumerate(texts) if t.isascii()]
+    joined = "".join([texts[i] for i in ascii_ids]).translate(table)
+    pos = 0
+    for i in ascii_ids:
+        end = pos + len(texts[i])
+        out[i] = joined[pos:end]
+        pos = end
+    return out
+
+
+def _hill_batch(texts: List[str], cipher: HillCipher, decrypt: bool) -> List[str]:
+    # Appending a message's X padding to the message itself gives the same
+    # output, and then every ASCII message covers whole blocks, so the group
+    # can be joined and run through one encrypt/decrypt call (one layout
+    # split and one block transform) and sliced back apart. Non-ASCII
+    # messages may change length when case folded and are done one by one.
+    n = len(cipher.key)
+    run = cipher.decrypt if decrypt else cipher.encrypt
+    out = [run(t) if not t.isascii() else "" for t in texts]
+
+    ascii_ids = [i for i, t in enumerate(texts) if t.isascii()]
+    padded: List[str] = []
+    for i in ascii_ids:
+        extra = len(_ASCII_SYMBOL_RUN.sub("", texts[i])) % n
+        if extra and decrypt:
+            raise ValueError(f"Hill ciphertext must contain a multiple of {n} letters.")
+        padded.append(texts[i] + "X" * (n - extra) if extra else texts[i])
+
+    joined = run("".join(padded))
+    pos = 0
+    for i, text in zip(ascii_ids, padded):
+        out[i] = joined[pos:pos + len(text)]
+        pos += len(text)
+    return out
+
+
+def _batch_group(cipher_cls: CipherType, key: Any, texts: List[str], decrypt: bool) -> List[str]:
+    cipher = cipher_cls(key)
+    if isinstance(cipher, CaesarCipher):
+        return _affine_batch(texts, 1, -key if decrypt else key, decrypt)
+    if isinstance(cipher, AffineCipher):
+        a, b = key
+        if decrypt:
+            a_inv = cipher._a_inv()
+            return _affine_batch(texts, a_inv, -a_inv * b, True)
+        return _affine_batch(texts, a, b, False)
+    if isinstance(cipher, HillCipher):
+        return _hill_batch(texts, cipher, decrypt)
+    # Playfair (and anything else): one cipher object, i.e. one key schedule, per key
+    run = cipher.decrypt if decrypt else cipher.encrypt
+    return [run(t) for t in texts]
+
+
+def _run_many(cipher_cls: CipherType, items: Iterable[Tuple[Any, str]], decrypt: bool) -> List[str]:
+    items = list(items)
+    groups: Dict[Any, List[int]] = {}
+    for i, (key, _) in enumerate(items):
+        groups.setdefault(_hashable_key(key), []).append(i)
+
+    results: List[str] = [""] * len(items)
+    for indices in groups.values():
+        key = items[indices[0]][0]
+        texts = [items[i][1] for i in indices]
+        for i, out in zip(indices, _batch_group(cipher_cls, key, texts, decrypt)):
+            results[i] = out
+    return results
+
+
+def encrypt_many(cipher: CipherType, items: Iterable[Tuple[Any, str]]) -> List[str]:
+    """Encrypt many (key, text) pairs with one cipher class.
+
+    Messages are grouped by key so each key schedule is built once, and
+    each group is processed in bulk. Results come back in input order and
+    match cipher(key).encrypt(text) exactly.
+    """
+    return _run_many(cipher, items, False)
+
+
+def decrypt_many(cipher: CipherType, items: Iterable[Tuple[Any, str]]) -> List[str]:
+    """Decrypt many (key, text) pairs; the counterpart of encrypt_many."""
+    return _run_many(cipher, items, True)
+
+
+# ---------------------------------------------------------------------------
+# 6) Cipher pipelines
+# ---------------------------------------------------------------------------
+
+class _AffineStage:
+    # Letter-code map y = (m * x + c) % 26 (Caesar and Affine stages)
+    def __init__(self, m: int, c: int) -> None:
+        self.table = _affine_code_table(m, c)
+
+    @_phase("transform")
+    def push(self, codes: bytes) -> bytes:
+        return codes.translate(self.table)
+
+    @_phase("transform")
+    def flush(self) -> bytes:
+        return b""
+
+
+class _PlayfairStage:
+    def __init__(self, cipher: PlayfairCipher, decrypt: bool) -> None:
+        self.decrypt = decrypt
+        self.table = cipher._decrypt_table if decrypt else cipher._encrypt_table
+        self.positions = cipher.positions
+        self.pending = ""
+
+    def __substitute(self, digrams: List[str]) -> bytes:
+        return _letter_codes(_playfair_substitute(digrams, self.table, self.positions))
+
+    @_phase("transform")
+    def push(self, codes: bytes) -> bytes:
+        letters = self.pending + codes.translate(_PLAYFAIR_LETTERS).decode("ascii")
+        if self.decrypt:
+            even = len(letters) - len(letters) % 2
+            self.pending = letters[even:]
+            return self.__substitute(_DIGRAM.findall(letters[:even]))
+        digrams, self.pending = _create_digrams(letters, final=False)
+        return self.__substitute(digrams)
+
+    @_phase("transform")
+    def flush(self) -> bytes:
+        pending, self.pending = self.pending, ""
+        if not pending:
+            return b""
+        if self.decrypt:
+            raise ValueError("Playfair ciphertext must contain an even number of letters.")
+        return self.__substitute(_create_digrams(pending)[0])
+
+
+class _HillStage:
+    def __init__(self, cipher: HillCipher, decrypt: bool) -> None:
+        self.decrypt = decrypt
+        self.key = cipher.inverse_key() if decrypt else cipher.key
+        self.n = len(cipher.key)
+        self.pending = b""
+
+    @_phase("transform")
+    def push(self, codes: bytes) -> bytes:
+        codes = self.pending + codes
+        whole = len(codes) - len(codes) % self.n
+        self.pending = codes[whole:]
+        return _hill_codes(codes[:whole], self.key)
+
+    @_phase("transform")
+    def flush(self) -> bytes:
+        pending, self.pending = self.pending, b""
+        if not pending:
+            return b""
+        if self.decrypt:
+            raise ValueError(f"Hill ciphertext must contain a multiple of {self.n} letters.")
+        return _hill_codes(pending + _X_CODE * (self.n - len(pending)), self.key)
+
+
+_Stage = Union[_AffineStage, _PlayfairStage, _HillStage]
+
+
+def _run_stages(stages: List[_Stage], codes: bytes) -> bytes:
+    # Whole input: push everything, then flush each stage into the next
+    for stage in stages:
+        codes = stage.push(codes) + stage.flush()
+    return codes
+
+
+class _StageWriter:
+    # Writer that runs the letters of whatever is written to it through a
+    # list of stages and lays them back into the text, streaming the result
+    # into the next writer. Pipelines chain these around Playfair decrypt
+    # stages, whose filler X removal has to see the text between letters.
+
+    def __init__(self, stages: List[_Stage], writer: Any, remove_x: bool) -> None:
+        self.stages = stages
+        self.target = _FillerXWriter(writer) if remove_x else None
+        self.out = _LayoutStream(self.target or writer)
+        self.writer = writer
+
+    def write(self, text: str) -> int:
+        codes = _letter_stream(text).codes
+        for stage in self.stages:
+            codes = stage.push(codes)
+        self.out.push(text, _code_letters(codes))
+        return len(text)
+
+    def close(self) -> int:
+        # Characters written to the final writer
+        written = self.out.close(_code_letters(_run_stages(self.stages, b"")))
+        if self.target is not None:
+            written += self.target.close()
+        if isinstance(self.writer, _StageWriter):
+            return self.writer.close()
+        return written
+
+
+class CipherPipeline:
+    """Product cipher: apply several ciphers one after another.
+
+    The text is split into letter codes once, every stage works on the
+    code stream and the result is laid back into the input once. Runs of
+    Caesar/Affine stages are fused into a single affine map. ``decrypt``
+    undoes the stages in reverse order. For ASCII text the output matches
+    calling each cipher's ``encrypt`` on the previous output; other
+    letters are reduced to A-Z by their uppercase code point, as the Hill
+    cipher does.
+    """
+
+    def __init__(self, ciphers: Iterable[Any]) -> None:
+        self.stages: List[Any] = []
+        for cipher in ciphers:
+            if isinstance(cipher, CaesarCipher):
+                m, c = 1, cipher.key
+            elif isinstance(cipher, AffineCipher):
+                m, c = cipher.key
+            elif isinstance(cipher, PlayfairCipher):
+                if any(not 'A' <= ch <= 'Z' for row in cipher.keymatrix for ch in row):
+                    raise ValueError("Playfair keys in a pipeline may only use the letters A-Z.")
+                self.stages.append(cipher)
+                continue
+            elif isinstance(cipher, HillCipher):
+                self.stages.append(cipher)
+                continue
+            else:
+                raise TypeError(f"Unsupported cipher: {type(cipher).__name__}")
+
+            if self.stages and isinstance(self.stages[-1], AffineCipher):
+                # (m2, c2) after (m1, c1) is x -> m2 * m1 * x + m2 * c1 + c2
+                m1, c1 = self.stages.pop().key
+                m, c = m * m1, m * c1 + c
+            self.stages.append(AffineCipher((m % 26, c % 26)))
+
+        if not self.stages:
+            raise ValueError("A cipher pipeline needs at least one cipher.")
+        if len(self.stages) > 1:
+            # The identity map only matters for the case folding of a pure
+            # Caesar/Affine pipeline; rendering takes care of that otherwise
+            self.stages = [st for st in self.stages if not (isinstance(st, AffineCipher) and st.key == (1, 0))]
+
+    def __affine_only(self) -> Optional[AffineCipher]:
+        # A single fused affine map runs as one str.translate of the text
+        if len(self.stages) == 1 and isinstance(self.stages[0], AffineCipher):
+            return self.stages[0]
+        return None
+
+    def __runners(self, decrypt: bool) -> List[_Stage]:
+        runners: List[_Stage] = []
+        for stage in reversed(self.stages) if decrypt else self.stages:
+            if isinstance(stage, AffineCipher):
+                a, b = stage.key
+                if decrypt:
+                    a_inv = stage._a_inv()
+                    a, b = a_inv, -a_inv * b
+                runners.append(_AffineStage(a, b))
+            elif isinstance(stage, PlayfairCipher):
+                runners.append(_PlayfairStage(stage, decrypt))
+            else:
+                runners.append(_HillStage(stage, decrypt))
+        return runners
+
+    def __segments(self) -> List[List[_Stage]]:
+        # Decryption stages, cut after every Playfair stage (filler X removal)
+        segments: List[List[_Stage]] = [[]]
+        for runner in self.__runners(True):
+            segments[-1].append(runner)
+            if isinstance(runner, _PlayfairStage):
+                segments.append([])
+        return [seg for seg in segments if seg]
+
+    @_operation()
+    def encrypt(self, plain_text: str) -> str:
+        affine = self.__affine_only()
+        if affine is not None:
+            return affine.encrypt(plain_text)
+        stream = _letter_stream(plain_text)
+        return _render(_run_stages(self.__runners(False), stream.codes), stream.layout)
+
+    @_operation()
+    def decrypt(self, cipher_text: str) -> str:
+        affine = self.__affine_only()
+        if affine is not None:
+            return affine.decrypt(cipher_text)
+        text = cipher_text
+        for segment in self.__segments():
+            stream = _letter_stream(text)
+            text = _render(_run_stages(segment, stream.codes), stream.layout)
+            if isinstance(segment[-1], _PlayfairStage):
+                text = _INSERTED_X.sub("", text)
+        return text.lower()
+
+    @_operation()
+    def encrypt_stream(self, reader: TextIO, writer: TextIO, chunk_size: int = CHUNK_SIZE) -> int:
+        affine = self.__affine_only()
+        if affine is not None:
+            return affine.encrypt_stream(reader, writer, chunk_size)
+        out = _StageWriter(self.__runners(False), writer, remove_x=False)
+        for chunk in _iter_chunks(reader, chunk_size):
+            out.write(chunk)
+        return out.close()
+
+    @_operation()
+    def decrypt_stream(self, reader: TextIO, writer: TextIO, chunk_size: int = CHUNK_SIZE) -> int:
+        affine = self.__affine_only()
+        if affine is not None:
+            return affine.decrypt_stream(reader, writer, chunk_size)
+        segments = self.__segments()
+        # Built back to front: each segment writes into the next one
+        target: Any = writer
+        for segment in reversed(segments):
+            remove_x = isinstance(segment[-1], _PlayfairStage)
+            if target is writer and not remove_x:
+                target = _LowerWriter(writer)
+            target = _StageWriter(segment, target, remove_x)
+        for chunk in _iter_chunks(reader, chunk_size):
+            target.write(chunk)
+        return target.close()
+
+
+# ---------------------------------------------------------------------------
+# 7) Incremental re-encryption
+# ---------------------------------------------------------------------------
+
+# Characters compared per step when looking for the edited span
+_EDIT_CHUNK = 1 << 12
+
+# Letters of the old Playfair output checked against a guessed digram boundary
+_PLAYFAIR_CHECK = 256
+
+_ASCII_LETTER = re.compile(r"[A-Za-z]")
+_LAST_ASCII_LETTER = re.compile(r"[A-Za-z][^A-Za-z]*\Z")
+_NON_ASCII_CHAR = re.compile(r"[^\x00-\x7f]")
+
+# bytes.translate deletion table that keeps A-Z / a-z only
+_NON_ASCII_LETTERS = bytes(b for b in range(256) if not (chr(b).isascii() and chr(b).isalpha()))
+
+
+def _common_prefix(a: str, b: str, limit: int, backwards: bool = False) -> int:
+    # Length of the common prefix (or suffix) of a and b, at most limit;
+    # chunks are compared at memcmp speed before narrowing down
+    def same(i: int, j: int) -> bool:
+        if backwards:
+            return a[len(a) - j:len(a) - i] == b[len(b) - j:len(b) - i]
+        return a[i:j] == b[i:j]
+
+    done = 0
+    while done < limit:
+        step = min(_EDIT_CHUNK, limit - done)
+        if not same(done, done + step):
+            lo, hi = 0, step - 1
+            while lo < hi:
+                mid = (lo + hi + 1) // 2
+                if same(done, done + mid):
+                    lo = mid
+                else:
+                    hi = mid - 1
+            return done + lo
+        done += step
+    return limit
+
+
+def find_edit(old_text: str, new_text: str) -> Tuple[int, int, str]:
+    """The edit that turns old_text into new_text, as (start, end, replacement).
+
+    new_text == old_text[:start] + replacement + old_text[end:], with the
+    smallest such span.
+    """
+    limit = min(len(old_text), len(new_text))
+    start = _common_prefix(old_text, new_text, limit)
+    tail = _common_prefix(old_text, new_text, limit - start, backwards=True)
+    return start, len(old_text) - tail, new_text[start:len(new_text) - tail]
+
+
+def _ascii_letters(text: str) -> bytes:
+    return text.encode("utf-8", "surrogatepass").translate(None, _NON_ASCII_LETTERS)
+
+
+def _count_letters(text: str) -> int:
+    # Number of ASCII letters in text
+    if np is not None and len(text) >= _NUMPY_MIN_LAYOUT:
+        folded = np.frombuffer(text.encode("utf-8", "surrogatepass"), dtype=np.uint8) | 32
+        folded -= ord('a')  # non-letters wrap around past 25
+        return int(np.count_nonzero(folded < 26))
+    return len(_ascii_letters(text))
+
+
+def _only_ascii_letters(*texts: str) -> bool:
+    # With no letters outside A-Z / a-z, input letters, layout slots and
+    # output positions correspond one to one
+    return all(t.isascii() or not any(ch.isalpha() for ch in _NON_ASCII_CHAR.findall(t)) for t in texts)
+
+
+def _letters_mod(text: str, pos: int, n: int, total: int) -> int:
+    # Letters in text[:pos] modulo n, given the letter count of the whole
+    # text modulo n; counted on whichever side of pos is shorter
+    if 2 * pos <= len(text):
+        return _count_letters(text[:pos]) % n
+    return (total - _count_letters(text[pos:])) % n
+
+
+def _letter_before(text: str, pos: int) -> int:
+    # Index of the last ASCII letter before pos, or -1
+    while pos > 0:
+        lo = max(0, pos - _EDIT_CHUNK)
+        m = _LAST_ASCII_LETTER.search(text, lo, pos)
+        if m:
+            return m.start()
+        pos = lo
+    return -1
+
+
+def _after_letters(text: str, pos: int, k: int) -> Optional[int]:
+    # Index just past the k-th ASCII letter from pos on, or None
+    m = next(itertools.islice(_ASCII_LETTER.finditer(text, pos), k - 1, None), None)
+    return m.end() if m else None
+
+
+def _hill_edit(cipher: HillCipher, old_text: str, old_result: str, start: int, end: int,
+               replacement: str, new_text: str, decrypt: bool) -> str:
+    # Output letters sit where the input letters were (padding goes at the
+    # end), so only the blocks the edit touches change, as long as the
+    # number of letters changes by a multiple of n. Otherwise every later
+    # block is realigned and the rest of the text is redone.
+    run = cipher.decrypt if decrypt else cipher.encrypt
+    n = len(cipher.key)
+    # Encryption pads the letters to whole blocks at the end of the output
+    padding = len(old_result) - len(old_text)
+    if not 0 <= padding < n:
+        return run(new_text)
+    before = _letters_mod(old_text, start, n, -padding)
+    added = _count_letters(replacement)
+    removed = _count_letters(old_text[start:end])
+
+    # Back to the start of the block the edit begins in
+    p = start
+    for _ in range(before % n):
+        p = _letter_before(old_text, p)
+
+    if (added - removed) % n == 0:
+        # On to the end of the block the edit ends in
+        q: Optional[int] = start + len(replacement)
+        rest = -(before + added) % n
+        if rest:
+            q = _after_letters(new_text, q, rest)
+        if q is not None:
+            shift = len(replacement) - (end - start)
+            return old_result[:p] + run(new_text[p:q]) + old_result[q - shift:]
+    return old_result[:p] + run(new_text[p:])
+
+
+def _digram_letters(text: str) -> int:
+    # len("".join(_create_digrams(text)[0])) without building the digrams
+    start = 0
+    inserted = 0
+    for m in _DOUBLED_LETTER.finditer(text):
+        i = m.start()
+        if (i - start) % 2 == 0:
+            inserted += 1
+            start = i + 1
+    total = len(text) + inserted
+    return total + total % 2
+
+
+def _playfair_encrypt_edit(cipher: PlayfairCipher, old_text: str, old_result: str, start: int,
+                           new_text: str) -> Optional[str]:
+    # Digrams are re-formed from the digram boundary before the edit to
+    # the end, as filler X's after the edit may move. The boundary is at
+    # the letter before the edit or the one after; the right one is the
+    # one whose digrams, counted back from the end of the old output, line
+    # up with the old cipher letters. Output letters sit in the input's
+    # letter slots (surplus at the end), so the old output from the letter
+    # before the edit on holds every cipher letter that is needed.
+    prev = _letter_before(old_text, start)
+    if prev < 0 or 2 * (len(old_text) - prev) > len(old_text):
+        # Near the start, encrypting everything is cheaper
+        return None
+    old_letters = _ascii_letters(old_result[prev:]).decode("ascii")
+    tail_letters = _ascii_letters(old_text[prev:]).upper().replace(b"J", b"I").decode("ascii")
+    for boundary, first in ((prev, 0), (start, 1)):
+        letters = tail_letters[first:]
+        # Index of the boundary's cipher letter in old_letters
+        k = len(old_letters) - _digram_letters(letters)
+        digrams, _ = _create_digrams(letters[:_PLAYFAIR_CHECK], final=len(letters) <= _PLAYFAIR_CHECK)
+        head = _playfair_substitute(digrams, cipher._encrypt_table, cipher.positions)
+        if k >= first and old_letters[k:k + len(head)] == head:
+            break
+    else:
+        return None
+
+    # Cipher letters before the boundary keep their values; from the edit
+    # on they are laid out in the new text
+    p = prev if k == 0 else start
+    kept = old_letters[min(k, 1):k]
+
+    tail = _letter_stream(new_text[boundary:])
+    digrams, _ = _create_digrams(_playfair_letters(tail))
+    cipher_chars = kept + _playfair_substitute(digrams, cipher._encrypt_table, cipher.positions)
+    layout = tail.layout if p == boundary else _letter_stream(new_text[p:]).layout
+    return old_result[:p] + _place_letters(cipher_chars, layout)
+
+
+def _playfair_merged(cipher: PlayfairCipher, text: str) -> str:
+    # Decrypted letters laid into text, before filler X removal
+    stream = _letter_stream(text)
+    cleaned = _playfair_letters(stream)
+    if len(cleaned) % 2 == 1:
+        raise ValueError("Playfair ciphertext must contain an even number of letters.")
+    plain = _playfair_substitute(_DIGRAM.findall(cleaned), cipher._decrypt_table, cipher.positions)
+    return _place_letters(plain, stream.layout)
+
+
+def _playfair_plain_pairs(cipher: PlayfairCipher) -> Any:
+    # (first * 26 + second letter code) -> decrypted digram as two ASCII
+    # codes, with J read as I
+    letters = [chr(ord('A') + (8 if c == 9 else c)) for c in range(26)]
+    return np.array([[ord(ch) for ch in cipher._decrypt_table[a + b]] for a in letters for b in letters],
+                    dtype=np.uint8)
+
+
+def _removed_x(cipher: PlayfairCipher, text: str, lead: str = "") -> int:
+    # Filler X's that decryption removes from lead + the merged decryption
+    # of text (the first and last character are never removed). lead is a
+    # few characters of already merged output in front of text
+    if np is None or len(text) < _NUMPY_MIN_LAYOUT or not (text.isascii() and lead.isascii()):
+        merged = lead + _playfair_merged(cipher, text)
+        return len(merged) - len(_INSERTED_X.sub("", merged))
+    data = np.frombuffer((lead + text).encode("ascii"), dtype=np.uint8)
+    folded = (data | 32) - ord('a')  # non-letters wrap around past 25
+    mask = folded < 26
+    mask[:len(lead)] = False
+    codes = folded[mask].astype(np.intp)
+    if len(codes) % 2 == 1:
+        raise ValueError("Playfair ciphertext must contain an even number of letters.")
+    merged = data.copy()
+    merged[mask] = _playfair_plain_pairs(cipher)[codes[0::2] * 26 + codes[1::2]].ravel()
+    return int(np.count_nonzero((merged[1:-1] == ord('X')) & (merged[:-2] == merged[2:])))
+
+
+def _playfair_decrypt_edit(cipher: PlayfairCipher, old_text: str, old_result: str, start: int, end: int,
+                           replacement: str, new_text: str) -> Optional[str]:
+    # Digrams are fixed letter pairs, so only the digrams the edit touches
+    # decrypt differently (an odd change in the number of letters leaves
+    # the text undecryptable and is left to the full decrypt to report).
+    # A filler X is removed when its two neighbours are equal, so outputs
+    # from the character before those digrams to the one after them are
+    # redone, from a window one digram wider on each side. Removed X's
+    # shift the output, so the splice offset comes from counting the X's
+    # removed on the shorter side of the window (vectorised with NumPy).
+    if (_count_letters(replacement) - _count_letters(old_text[start:end])) % 2:
+        return None
+    before = _letters_mod(old_text, start, 2, 0)
+    shift = len(replacement) - (end - start)
+
+    # p: start of the digram the edit begins in; P: one digram earlier
+    p = start if before == 0 else _letter_before(old_text, start)
+    first = _letter_before(old_text, p)
+    window_start = _letter_before(old_text, first) if first >= 0 else -1
+    splice_start = p - 1 if window_start >= 0 else 0
+    window_start = max(window_start, 0)
+
+    # q: end of the digram the edit ends in (new text); Q: one digram later
+    q: Optional[int] = start + len(replacement)
+    if (before + _count_letters(replacement)) % 2:
+        q = _after_letters(new_text, q, 1)
+        if q is None:
+            return None
+    window_end = _after_letters(new_text, q, 2)
+    lead = 1 if splice_start else 0
+    if window_end is None:
+        new_end = len(new_text)
+        ahead = 0
+    else:
+        new_end = window_end - 1
+        ahead = 1
+
+    def piece(text: str, stop: int) -> str:
+        # Outputs for text[splice_start:stop] with filler X's removed
+        merged = _playfair_merged(cipher, text[window_start:stop + ahead])
+        out = _INSERTED_X.sub("", merged[splice_start - lead - window_start:])
+        return out[lead:len(out) - ahead]
+
+    new_piece = piece(new_text, new_end)
+    old_piece = piece(old_text, new_end - shift)
+    if len(old_text) - (new_end - shift) < p:
+        # Count from the end: removed X's from the window's last output on
+        splice_end = len(old_result)
+        if window_end is not None:
+            lead_chars = _playfair_merged(cipher, old_text[window_start:window_end - shift])[-2:]
+            removed = _removed_x(cipher, old_text[window_end - shift:], lead_chars)
+            splice_end -= len(old_text) - (new_end - shift) - removed
+        splice_begin = splice_end - len(old_piece)
+    else:
+        # Count from the start: removed X's before the splice
+        splice_begin = splice_start - (_removed_x(cipher, old_text[:p]) if splice_start else 0)
+        splice_end = splice_begin + len(old_piece)
+    if not 0 <= splice_begin <= splice_end <= len(old_result):
+        return None
+    return old_result[:splice_begin] + new_piece.lower() + old_result[splice_end:]
+
+
+def _edit(cipher: Any, old_text: str, old_result: str, start: int, end: int,
+          replacement: str, decrypt: bool) -> str:
+    if not 0 <= start <= end <= len(old_text):
+        raise ValueError("Edit range is outside the text.")
+    new_text = old_text[:start] + replacement + old_text[end:]
+    run = cipher.decrypt if decrypt else cipher.encrypt
+
+    if isinstance(cipher, (CaesarCipher, AffineCipher)):
+        # One output character per input character, unless case folding
+        # changed lengths or a final sigma depends on its neighbours
+        piece = run(replacement)
+        if (len(piece) == len(replacement) and len(old_result) == len(old_text)
+                and "Σ" not in replacement and "Σ" not in old_text):
+            return old_result[:start] + piece + old_result[end:]
+    elif isinstance(cipher, (HillCipher, PlayfairCipher)) and _only_ascii_letters(old_text, replacement):
+        if isinstance(cipher, HillCipher):
+            return _hill_edit(cipher, old_text, old_result, start, end, replacement, new_text, decrypt)
+        if decrypt:
+            spliced = _playfair_decrypt_edit(cipher, old_text, old_result, start, end, replacement, new_text)
+        else:
+            spliced = _playfair_encrypt_edit(cipher, old_text, old_result, start, new_text)
+        if spliced is not None:
+            return spliced
+    return run(new_text)
+
+
+def encrypt_edit(cipher: Any, old_text: str, old_result: str, start: int, end: int,
+                 replacement: str) -> str:
+    """Re-encrypt old_text after replacing old_text[start:end] with replacement.
+
+    old_result must be cipher.encrypt(old_text). Only the part of the
+    output that the edit can change is recomputed and spliced into
+    old_result: one character per edited character for Caesar/Affine, the
+    touching blocks for Hill (the rest of the text if the letter count
+    changes by other than a multiple of n) and the digrams from the edit
+    to the end for Playfair. Anything else, including text with non-ASCII
+    letters, is encrypted in full. The result equals
+    cipher.encrypt(old_text[:start] + replacement + old_text[end:]).
+    """
+    return _edit(cipher, old_text, old_result, start, end, replacement, False)
+
+
+def decrypt_edit(cipher: Any, old_text: str, old_result: str, start: int, end: int,
+                 replacement: str) -> str:
+    """Decrypt after an edit of the ciphertext; the counterpart of encrypt_edit.
+
+    Playfair ciphertext digrams are fixed, so only the digrams the edit
+    touches are decrypted again.
+    """
+    return _edit(cipher, old_text, old_result, start, end, replacement, True)
@@ -0,0 +1,179 @@
+"""
+English n-gram statistics used by the ciphertext-only attacks.
+
+Tables hold log10 probabilities for every monogram .. quadgram and are
+indexed by integer letter codes (A=0 .. Z=25): the n-gram c1 c2 .. cn sits
+at c1 * 26**(n-1) + ... + cn. They are read lazily from
+data/english_ngrams.bin (rebuild with tools/build_ngram_tables.py) on first
+use, so importing this module does no I/O.
+
+Sequences are scored with a rolling index (idx = idx * 26 + c, mod 26**n),
+vectorized with NumPy for long inputs. NgramScorer keeps a running total
+that can be updated when only a few positions change.
+"""
+
+from __future__ import annotations
+
+import functools
+import os
+import re
+import struct
+import zlib
+from array import array
+from typing import Dict, List, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+NGRAM_FILE = os.path.join(os.path.dirname(__file__), "data", "english_ngrams.bin")
+MAGIC = b"CSNG1\n"
+MAX_ORDER = 4
+SCALE = 16  # quantisation steps per decade: log10(p) = -byte / SCALE
+
+
+@functools.lru_cache(maxsize=None)
+def _raw_tables() -> Tuple[bytes, ...]:
+    with open(NGRAM_FILE, "rb") as f:
+        data = f.read()
+    if not data.startswith(MAGIC):
+        raise ValueError(f"{NGRAM_FILE} is not an n-gram table file.")
+
+    tables: List[bytes] = []
+    pos = len(MAGIC)
+    for _ in range(MAX_ORDER):
+        (size,) = struct.unpack_from("<I", data, pos)
+        pos += 4
+        tables.append(zlib.decompress(data[pos:pos + size]))
+        pos += size
+    return tuple(tables)
+
+
+@functools.lru_cache(maxsize=None)
+def log_probs(n: int) -> array:
+    # log10 probability of every n-gram, as a flat float32 array (the
+    # quantised values are exact in float32)
+    return array("f", [-q / SCALE for q in _raw_tables()[n - 1]])
+
+
+@functools.lru_cache(maxsize=None)
+def log_probs_array(n: int):
+    # Same table as a NumPy float32 array (requires NumPy)
+    return np.frombuffer(_raw_tables()[n - 1], dtype=np.uint8).astype(np.float32) / -SCALE
+
+
+_NON_LETTERS = re.compile(r"[^A-Z]+")
+_CODE_TABLE = bytes((b - ord('A')) % 256 for b in range(256))
+
+# Below this many codes the NumPy round trip costs more than it saves
+_NUMPY_MIN_CODES = 128
+
+
+def text_to_codes(text: str) -> List[int]:
+    # A-Z letters only, case-insensitive; everything else is dropped
+    letters = _NON_LETTERS.sub("", text.upper()).encode("ascii")
+    return list(letters.translate(_CODE_TABLE))
+
+
+def _total_numpy(codes: Sequence[int], n: int) -> float:
+    arr = np.asarray(codes, dtype=np.int32)
+    count = len(arr) - n + 1
+    idx = arr[:count].copy()
+    for k in range(1, n):
+        idx *= 26
+        idx += arr[k:k + count]
+    return float(log_probs_array(n)[idx].sum(dtype=np.float64))
+
+
+def total_log_prob(codes: Sequence[int], n: int = 4) -> float:
+    # Sum of log10 probabilities of every n-gram in codes
+    if len(codes) < n:
+        return 0.0
+    if np is not None and (len(codes) >= _NUMPY_MIN_CODES or isinstance(codes, np.ndarray)):
+        return _total_numpy(codes, n)
+
+    table = log_probs(n)
+    mod = 26 ** (n - 1)
+    total = 0.0
+    idx = 0
+    for i, c in enumerate(codes):
+        idx = (idx % mod) * 26 + c
+        if i >= n - 1:
+            total += table[idx]
+    return total
+
+
+def score_codes(codes: Sequence[int], n: int = 4) -> float:
+    # Mean log10 probability per n-gram (higher is more English-like)
+    count = len(codes) - n + 1
+    if count <= 0:
+        return float("-inf")
+    return total_log_prob(codes, n) / count
+
+
+class NgramScorer:
+    """Running n-gram log probability of a letter-code sequence.
+
+    After point changes only the n-grams that overlap a changed position
+    are rescored, so hill-climbing attacks that alter a few letters per step
+    pay O(changes * n) instead of O(len).
+    """
+
+    def __init__(self, codes: Sequence[int], n: int = 4) -> None:
+        self.n = n
+        self.codes = list(codes)
+        self.total = total_log_prob(self.codes, n)
+        self._table = log_probs(n)
+
+    def score(self) -> float:
+        # Mean log10 probability per n-gram, as score_codes
+        count = len(self.codes) - self.n + 1
+        return self.total / count if count > 0 else float("-inf")
+
+    def _windows(self, positions: Sequence[int]) -> List[Tuple[int, int]]:
+        # Merged ranges of n-gram start positions touching any position
+        last_start = len(self.codes) - self.n
+        ranges: List[Tuple[int, int]] = []
+        for p in sorted(positions):
+            lo, hi = max(0, p - self.n + 1), min(p, last_start)
+            if lo > hi:
+                continue
+            if ranges and lo <= ranges[-1][1] + 1:
+                ranges[-1] = (ranges[-1][0], max(ranges[-1][1], hi))
+            else:
+                ranges.append((lo, hi))
+        return ranges
+
+    def _sum(self, ranges: List[Tuple[int, int]]) -> float:
+        codes, table, n = self.codes, self._table, self.n
+        total = 0.0
+        for lo, hi in ranges:
+            for i in range(lo, hi + 1):
+                idx = 0
+                for c in codes[i:i + n]:
+                    idx = idx * 26 + c
+                total += table[idx]
+        return total
+
+    def delta(self, changes: Dict[int, int]) -> float:
+        # Change in total if codes[pos] = code for every (pos, code), without
+        # applying it
+        ranges = self._windows(list(changes))
+        old_codes = {p: self.codes[p] for p in changes}
+        before = self._sum(ranges)
+        for p, c in changes.items():
+            self.codes[p] = c
+        after = self._sum(ranges)
+        for p, c in old_codes.items():
+            self.codes[p] = c
+        return after - before
+
+    def update(self, changes: Dict[int, int]) -> float:
+        # Apply the changes and return the new total
+        ranges = self._windows(list(changes))
+        before = self._sum(ranges)
+        for p, c in changes.items():
+            self.codes[p] = c
+        self.total += self._sum(ranges) - before
+        return self.total